@@ -0,0 +1,428 @@
+"""Scale benchmark for the views, procedures, functions and page queries.
+
+For each requested scale this rebuilds a scratch database from
+table_creation.txt and view_trigger_procedure_functions.txt, fills it with
+generate_data.py output through bulk_load.py, trains the movie
+recommendations (recording training time and offline precision@10), then
+times every query and writes a JSON report:
+
+    python benchmark.py --database sidrama_bench --scales small,medium --report bench.json
+    python benchmark.py --database sidrama_bench --scales small --baseline bench.json
+
+With --baseline, any query whose median slowed down by more than
+--max-slowdown (and by more than --min-ms) fails the run with exit code 1.
+Works against a local MySQL 8 or MariaDB; the target database is DROPPED
+and recreated, so never point it at real data.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import mysql.connector
+
+import bulk_load
+import generate_data
+import recommender
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_SCRIPTS = ("table_creation.txt", "view_trigger_procedure_functions.txt")
+
+VIEWS = ("movie_reviews_view", "popular_movies", "episode_reviews_view", "movie_details_view",
+         "show_details_view", "user_stats_view", "top_rated_shows", "recent_activity_view")
+
+
+# Schema setup
+def split_sql_script(text):
+    """Split a mysql-client style script into statements, honouring DELIMITER lines"""
+    delimiter = ";"
+    statements = []
+    buffer = []
+    for line in text.splitlines():
+        match = re.match(r"\s*DELIMITER\s+(\S+)\s*$", line, re.IGNORECASE)
+        if match:
+            delimiter = match.group(1)
+            continue
+        buffer.append(line)
+        if line.rstrip().endswith(delimiter):
+            statement = "\n".join(buffer).rstrip()[:-len(delimiter)]
+            buffer = []
+            # Skip chunks that are nothing but comments
+            if any(l.strip() and not l.strip().startswith("--") for l in statement.splitlines()):
+                statements.append(statement)
+    return statements
+
+
+def reset_database(conn, database):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+        cursor.execute(f"CREATE DATABASE `{database}`")
+        cursor.execute(f"USE `{database}`")
+        for script in SCHEMA_SCRIPTS:
+            with open(os.path.join(ROOT, script), encoding="utf-8") as f:
+                for statement in split_sql_script(f.read()):
+                    cursor.execute(statement)
+        conn.commit()
+    finally:
+        cursor.close()
+
+
+def load_dataset(conn, data_dir, manifest, batch_size):
+    """Bulk-load a generated dataset; returns per-table load timings"""
+    timings = {}
+    bulk_load.set_trigger_bypass(conn, True)
+    try:
+        for table in manifest["load_order"]:
+            start = time.perf_counter()
+            rows = bulk_load.load_with_executemany(
+                conn, table, os.path.join(data_dir, f"{table}.csv"), batch_size, lambda loaded: None
+            )
+            elapsed = time.perf_counter() - start
+            timings[table] = {"rows": rows, "seconds": round(elapsed, 3),
+                              "rows_per_sec": round(rows / elapsed) if elapsed > 0 else None}
+    finally:
+        bulk_load.set_trigger_bypass(conn, False)
+
+    start = time.perf_counter()
+    bulk_load.recompute_aggregates(conn, set(manifest["load_order"]))
+    timings["recompute_aggregates"] = {"seconds": round(time.perf_counter() - start, 3)}
+    return timings
+
+
+# Query catalogue
+def sample_parameters(conn):
+    """Pick realistic arguments: the busiest user, the most reviewed titles, etc."""
+    cursor = conn.cursor()
+
+    def scalar(sql, params=()):
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    try:
+        params = {
+            "user_id": scalar("SELECT user_id FROM user_stats ORDER BY total_reviews DESC LIMIT 1"),
+            "movie_id": scalar("SELECT movie_id FROM Movie ORDER BY total_reviews DESC LIMIT 1"),
+            "show_id": scalar("SELECT show_id FROM tvshow ORDER BY total_reviews DESC LIMIT 1"),
+            "genre": scalar("SELECT name FROM Genre ORDER BY genre_id LIMIT 1"),
+            "director": scalar("SELECT d.name FROM Director d JOIN Movie_Director md "
+                               "ON md.director_id = d.director_id LIMIT 1"),
+            "actor": scalar("SELECT a.name FROM Actor a JOIN Movie_Actor ma ON ma.actor_id = a.actor_id LIMIT 1"),
+            "language": scalar("SELECT language FROM Movie GROUP BY language ORDER BY COUNT(*) DESC LIMIT 1"),
+            "follower_id": scalar("SELECT follower_id FROM User_Followers "
+                                  "GROUP BY follower_id ORDER BY COUNT(*) DESC LIMIT 1"),
+        }
+        params["episode_id"] = scalar("SELECT episode_id FROM Episode WHERE show_id = %s LIMIT 1",
+                                      (params["show_id"],))
+        movie_name = scalar("SELECT name FROM Movie WHERE movie_id = %s", (params["movie_id"],)) or "the"
+        params["term"] = movie_name.split()[0].lower()
+        params["unreviewed_movie_id"] = scalar(
+            "SELECT m.movie_id FROM Movie m WHERE NOT EXISTS "
+            "(SELECT 1 FROM Review r WHERE r.user_id = %s AND r.movie_id = m.movie_id) LIMIT 1",
+            (params["user_id"],)
+        )
+        params["review_id"] = scalar(
+            "SELECT r.review_id FROM Review r WHERE NOT EXISTS "
+            "(SELECT 1 FROM Review_Likes rl WHERE rl.review_id = r.review_id AND rl.user_id = %s) LIMIT 1",
+            (params["user_id"],)
+        )
+    finally:
+        cursor.close()
+    return params
+
+
+def query_catalogue(p):
+    """(group, name, kind, statement, args); kind is sql, proc or write"""
+    queries = []
+    for view in VIEWS:
+        queries.append(("view", view, "sql", f"SELECT * FROM {view} LIMIT 100", ()))
+    queries.append(("view", "user_stats_view (one user)", "sql",
+                    "SELECT * FROM user_stats_view WHERE user_id = %s", (p["user_id"],)))
+
+    queries += [
+        ("procedure", "get_user_reviews", "proc", "get_user_reviews", (p["user_id"],)),
+        ("procedure", "search_movies_by_genre", "proc", "search_movies_by_genre", (p["genre"],)),
+        ("procedure", "get_movies_by_director", "proc", "get_movies_by_director", (p["director"],)),
+        ("procedure", "get_movies_by_actor", "proc", "get_movies_by_actor", (p["actor"],)),
+        ("procedure", "get_show_details", "proc", "get_show_details", (p["show_id"],)),
+        ("procedure", "advanced_movie_search (all filters)", "proc", "advanced_movie_search",
+         (p["term"], p["genre"], 3.0, p["language"], 1990, 2020)),
+        ("procedure", "advanced_movie_search (no filters)", "proc", "advanced_movie_search",
+         (None, None, None, None, None, None)),
+        ("procedure", "get_user_statistics", "proc", "get_user_statistics", (p["user_id"],)),
+        ("procedure", "get_top_grossing_movies", "proc", "get_top_grossing_movies", (10,)),
+        ("procedure", "get_trending_movies", "proc", "get_trending_movies", (30,)),
+        ("procedure", "search_catalog", "proc", "search_catalog", (p["term"], 20)),
+        ("procedure", "get_user_reviews_page", "proc", "get_user_reviews_page", (p["user_id"], None, None, 21)),
+        ("procedure", "get_following_feed_page (most follows)", "proc", "get_following_feed_page",
+         (p["follower_id"] or p["user_id"], None, None, 21)),
+    ]
+
+    for name, args in (
+        ("get_user_avg_rating", (p["user_id"],)),
+        ("count_user_reviews", (p["user_id"],)),
+        ("has_reviewed_movie", (p["user_id"], p["movie_id"])),
+        ("get_user_total_likes", (p["user_id"],)),
+        ("calculate_movie_popularity", (p["movie_id"],)),
+        ("count_movies_reviewed", (p["user_id"],)),
+        ("count_episodes_reviewed", (p["user_id"],)),
+        ("has_reviewed_episode", (p["user_id"], p["episode_id"])),
+        ("to_boolean_prefix_query", (p["term"],)),
+        ("feed_fanout_limit", ()),
+    ):
+        queries.append(("function", name, "sql",
+                        f"SELECT {name}({', '.join(['%s'] * len(args))})", args))
+
+    # Mirrors of the queries streamlit_app.py issues per page
+    queries += [
+        ("page", "home: popular movies", "sql",
+         "SELECT m.*, m.ratings AS avg_rating FROM title_leaderboard lb JOIN Movie m "
+         "ON m.movie_id = lb.entity_id WHERE lb.board = 'popular_movies' ORDER BY lb.rank_no LIMIT 6", ()),
+        ("page", "home: top shows", "sql",
+         "SELECT s.* FROM title_leaderboard lb JOIN tvshow s ON s.show_id = lb.entity_id "
+         "WHERE lb.board = 'top_shows' ORDER BY lb.rank_no LIMIT 4", ()),
+        ("page", "home: trending", "sql",
+         "SELECT lb.rank_no, lb.entity_type, COALESCE(m.name, s.name) AS name FROM title_leaderboard lb "
+         "LEFT JOIN Movie m ON lb.entity_type = 'Movie' AND m.movie_id = lb.entity_id "
+         "LEFT JOIN tvshow s ON lb.entity_type = 'TV Show' AND s.show_id = lb.entity_id "
+         "WHERE lb.board = 'trending' ORDER BY lb.rank_no LIMIT 5", ()),
+        ("page", "movies: first page", "sql",
+         "SELECT m.movie_id, m.name, m.release_date, m.ratings, m.genres FROM movie_card m ORDER BY m.ratings DESC, m.release_date DESC, m.movie_id DESC LIMIT 21", ()),
+        ("page", "movies: title + genre + rating", "sql",
+         "SELECT m.movie_id, m.name, m.release_date, m.ratings, m.genres FROM movie_card m "
+         "WHERE MATCH(m.name) AGAINST (%s IN BOOLEAN MODE) AND EXISTS ("
+         "SELECT 1 FROM Movie_Genre mg JOIN Genre g ON mg.genre_id = g.genre_id "
+         "WHERE mg.movie_id = m.movie_id AND g.name = %s) AND m.ratings >= %s "
+         "ORDER BY m.ratings DESC, m.release_date DESC, m.movie_id DESC LIMIT 21",
+         (f"+{p['term']}*", p["genre"], 2.0)),
+        ("page", "movies: open card reviews", "sql",
+         "SELECT review_id, username, rating, review_text, review_date, likes_count FROM movie_reviews_view "
+         "WHERE movie_id = %s ORDER BY review_date DESC, review_id DESC LIMIT 5", (p["movie_id"],)),
+        ("page", "tv shows: first page", "sql",
+         "SELECT s.show_id, s.name, s.release_date, s.ratings, s.num_of_seasons, s.genres "
+         "FROM show_card s ORDER BY s.ratings DESC, s.release_date DESC, s.show_id DESC LIMIT 21", ()),
+        ("page", "tv shows: season stats", "sql",
+         "SELECT season_number, total_reviews, rating_sum / NULLIF(rating_count, 0) AS avg_rating "
+         "FROM season_stats WHERE show_id = %s AND total_reviews > 0 ORDER BY season_number",
+         (p["show_id"],)),
+        ("page", "tv shows: episodes", "sql",
+         "SELECT * FROM Episode WHERE show_id = %s "
+         "ORDER BY season_number, episode_no, episode_id LIMIT 21", (p["show_id"],)),
+        ("page", "home: recommended for you", "sql",
+         recommender.RECOMMEND_SQL, recommender.recommendation_params(p["user_id"], 6)),
+        ("page", "statistics: user summary", "sql",
+         "SELECT total_reviews, movies_reviewed, episodes_reviewed, total_likes_received, "
+         "rating_sum / NULLIF(rating_count, 0) AS avg_rating_given FROM user_stats WHERE user_id = %s",
+         (p["user_id"],)),
+        ("page", "profile", "sql",
+         "SELECT u.*, us.total_reviews FROM User u LEFT JOIN user_stats us ON us.user_id = u.user_id "
+         "WHERE u.user_id = %s", (p["user_id"],)),
+    ]
+
+    # Writes run inside a transaction that is rolled back, so the dataset stays fixed
+    if p["unreviewed_movie_id"]:
+        queries.append(("write", "review insert (with triggers)", "write",
+                        "INSERT INTO Review (user_id, movie_id, rating, review_text) VALUES (%s, %s, %s, %s)",
+                        (p["user_id"], p["unreviewed_movie_id"], 4.0, "benchmark")))
+    if p["review_id"]:
+        queries.append(("write", "review like (with triggers)", "write",
+                        "INSERT INTO Review_Likes (review_id, user_id) VALUES (%s, %s)",
+                        (p["review_id"], p["user_id"])))
+        queries.append(("write", "review like (queued, as the app does)", "write",
+                        "INSERT INTO Review_Like_Events (review_id, user_id, liked) VALUES (%s, %s, TRUE)",
+                        (p["review_id"], p["user_id"])))
+    return queries
+
+
+MAINTENANCE = (
+    ("reconcile_rating_aggregates", "reconcile_rating_aggregates", ()),
+    ("rebuild_user_stats", "rebuild_user_stats", ()),
+    ("refresh_leaderboard (incremental)", "refresh_leaderboard", (False,)),
+    ("refresh_leaderboard (full)", "refresh_leaderboard", (True,)),
+    ("rebuild_catalog_cards", "rebuild_catalog_cards", ()),
+    ("rebuild_feed_inbox", "rebuild_feed_inbox", ()),
+)
+
+
+def train_recommender(conn, k=10):
+    """Time a full movie_neighbors rebuild, then score the model offline (precision@k)"""
+    start = time.perf_counter()
+    ratings = recommender.load_ratings(conn)
+    movie_ids, content = recommender.load_catalog(conn)
+    model = recommender.ItemItemModel().fit(ratings, movie_ids, content)
+    recommender.save_neighbors(conn, model, movie_ids)
+    train_seconds = time.perf_counter() - start
+    evaluation = recommender.evaluate(ratings, movie_ids, content, k)
+    return {
+        "ratings": len(ratings["review_id"]),
+        "movies": len(movie_ids),
+        "train_seconds": round(train_seconds, 3),
+        "evaluation_train_seconds": round(evaluation["train_seconds"], 3),
+        "evaluated_users": evaluation["users"],
+        f"precision_at_{k}": round(evaluation["precision"], 4),
+        f"recall_at_{k}": round(evaluation["recall"], 4),
+        f"popular_precision_at_{k}": round(evaluation["baseline_precision"], 4),
+    }
+
+
+# Timing
+def run_once(conn, kind, statement, args):
+    """Execute one query, consume every row it returns, and return the row count"""
+    cursor = conn.cursor()
+    rows = 0
+    try:
+        if kind == "proc":
+            cursor.callproc(statement, args)
+            for result in cursor.stored_results():
+                rows += len(result.fetchall())
+        else:
+            cursor.execute(statement, args)
+            if cursor.with_rows:
+                rows = len(cursor.fetchall())
+            else:
+                rows = cursor.rowcount
+        if kind == "write":
+            conn.rollback()
+    finally:
+        cursor.close()
+    return rows
+
+
+def time_query(conn, kind, statement, args, repeat, warmup=1):
+    for _ in range(warmup):
+        run_once(conn, kind, statement, args)
+    samples = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = run_once(conn, kind, statement, args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "rows": rows,
+        "min_ms": round(samples[0], 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def benchmark_scale(conn, database, scale, sizes, args):
+    print(f"[{scale}] resetting {database}", file=sys.stderr)
+    reset_database(conn, database)
+
+    with tempfile.TemporaryDirectory(prefix=f"sidrama_{scale}_") as data_dir:
+        print(f"[{scale}] generating data", file=sys.stderr)
+        start = time.perf_counter()
+        manifest = generate_data.generate(data_dir, seed=args.seed, **sizes)
+        generate_seconds = time.perf_counter() - start
+
+        print(f"[{scale}] loading {sum(manifest['rows'].values()):,} rows", file=sys.stderr)
+        load = load_dataset(conn, data_dir, manifest, args.batch_size)
+
+    cursor = conn.cursor()
+    cursor.execute("ANALYZE TABLE Movie, tvshow, Episode, Review, Review_Likes, User, user_stats")
+    cursor.fetchall()
+    cursor.close()
+
+    # The recommendation page query reads movie_neighbors, so fill it first
+    print(f"[{scale}] training recommendations", file=sys.stderr)
+    recommendations = train_recommender(conn)
+
+    params = sample_parameters(conn)
+    results = {}
+    for group, name, kind, statement, query_args in query_catalogue(params):
+        print(f"[{scale}] {group}: {name}", file=sys.stderr)
+        try:
+            results[f"{group}: {name}"] = time_query(conn, kind, statement, query_args, args.repeat)
+        except mysql.connector.Error as e:
+            conn.rollback()
+            results[f"{group}: {name}"] = {"error": str(e)}
+    for label, name, proc_args in MAINTENANCE:
+        results[f"maintenance: {label}"] = time_query(conn, "proc", name, proc_args, repeat=1, warmup=0)
+        conn.commit()
+
+    return {
+        "sizes": sizes,
+        "rows": manifest["rows"],
+        "generate_seconds": round(generate_seconds, 3),
+        "load": load,
+        "parameters": params,
+        "queries": results,
+        "recommender": recommendations,
+    }
+
+
+def find_regressions(report, baseline, max_slowdown, min_ms):
+    regressions = []
+    for scale, result in report["scales"].items():
+        previous = baseline.get("scales", {}).get(scale, {}).get("queries", {})
+        for name, timing in result["queries"].items():
+            before = previous.get(name, {}).get("median_ms")
+            after = timing.get("median_ms")
+            if before is None or after is None:
+                continue
+            if after > before * max_slowdown and after - before > min_ms:
+                regressions.append((scale, name, before, after))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time SIDRAMA queries against generated datasets")
+    parser.add_argument("--scales", default="small",
+                        help=f"comma-separated list of {', '.join(generate_data.SCALES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--report", default="bench_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare medians against")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--min-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    bulk_load.add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in scales if scale not in generate_data.SCALES]
+    if unknown:
+        raise SystemExit(f"Unknown scale(s): {', '.join(unknown)}")
+
+    if args.database is None:
+        raise SystemExit("Pass --database naming a scratch schema; it is dropped and recreated")
+    settings = bulk_load.connection_settings(args)
+    database = settings.pop("database")
+
+    conn = mysql.connector.connect(**settings, autocommit=False)
+    try:
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "server_version": conn.get_server_info(),
+            "repeat": args.repeat,
+            "scales": {},
+        }
+        for scale in scales:
+            report["scales"][scale] = benchmark_scale(conn, database, scale, generate_data.SCALES[scale], args)
+    finally:
+        conn.close()
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"Wrote {args.report}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.max_slowdown, args.min_ms)
+        for scale, name, before, after in regressions:
+            print(f"REGRESSION [{scale}] {name}: {before:.1f} ms -> {after:.1f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
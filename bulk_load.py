@@ -0,0 +1,311 @@
+"""Bulk loader for catalog and review dumps.
+
+Streams CSV or JSON Lines files into the database in batches instead of the
+row-at-a-time inserts the app uses:
+
+    python bulk_load.py Movie=movies.csv Episode=episodes.csv Review=reviews.jsonl
+    python bulk_load.py --local-infile Review=reviews.csv
+
+Files are loaded in the order given. CSV files need a header row; JSON files
+hold one object per line (a top-level JSON array also works but is read whole).
+Empty CSV fields become NULL.
+
+While loading, the session sets @skip_review_triggers / @skip_like_triggers so
+the per-row aggregate triggers stay out of the way, then rebuilds Movie/tvshow
+ratings, review counts, likes, user_stats, feed inboxes, the leaderboard and
+the catalog cards in one set-based pass at the end.
+Connection settings come from the [mysql] section of .streamlit/secrets.toml
+unless overridden on the command line.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from itertools import islice
+
+import mysql.connector
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+SECRETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+
+# Loadable tables and the columns a dump may supply for each
+LOADABLE_COLUMNS = {
+    "User": ("user_id", "username", "password", "name", "dob", "email", "ph_no", "address"),
+    "Movie": ("movie_id", "name", "total_duration", "descr", "box_office", "release_date",
+              "age_rating", "language", "poster_url"),
+    "tvshow": ("show_id", "name", "num_of_seasons", "num_of_episodes", "descr", "release_date",
+               "age_rating", "language", "poster_url", "status"),
+    "Episode": ("episode_id", "show_id", "season_number", "episode_no", "ep_descr", "duration",
+                "air_date", "title"),
+    "Review": ("review_id", "user_id", "movie_id", "episode_id", "date", "rating", "review_text"),
+    "Review_Likes": ("like_id", "review_id", "user_id", "liked_at"),
+    "User_Followers": ("follower_id", "following_id", "followed_at"),
+    "Genre": ("genre_id", "name", "description"),
+    "Actor": ("actor_id", "name", "dob", "gender", "bio", "profile_image_url"),
+    "Director": ("director_id", "name", "dob", "gender", "bio", "profile_image_url", "nationality"),
+    "Movie_Director": ("movie_id", "director_id"),
+    "Movie_Actor": ("movie_id", "actor_id", "character_name"),
+    "Movie_Genre": ("movie_id", "genre_id"),
+    "Show_Genre": ("show_id", "genre_id"),
+}
+
+# Tables whose rows feed the trigger-maintained aggregates
+AGGREGATE_SOURCES = {"User", "Movie", "tvshow", "Episode", "Review", "Review_Likes",
+                     "User_Followers", "Genre", "Actor", "Director", "Movie_Director", "Movie_Actor",
+                     "Movie_Genre", "Show_Genre"}
+
+RECOUNT_LIKES_SQL = """
+    UPDATE Review r
+    LEFT JOIN (
+        SELECT review_id, COUNT(*) AS likes
+        FROM Review_Likes
+        GROUP BY review_id
+    ) l ON l.review_id = r.review_id
+    SET r.likes_count = COALESCE(l.likes, 0)
+    WHERE r.likes_count <> COALESCE(l.likes, 0)
+"""
+
+
+# Input readers
+def read_csv_rows(path):
+    """Yield (columns, row tuple) pairs from a CSV file with a header row"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        columns = tuple(next(reader, ()))
+        for row in reader:
+            if row:
+                yield columns, tuple(value if value != "" else None for value in row)
+
+
+def read_json_rows(path):
+    """Yield (columns, row tuple) pairs from a JSON Lines file (or a JSON array)"""
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        records = json.load(f) if first == "[" else (json.loads(line) for line in f if line.strip())
+        for record in records:
+            columns = tuple(record)
+            yield columns, tuple(record[column] for column in columns)
+
+
+def read_rows(path):
+    if path.lower().endswith(".csv"):
+        return read_csv_rows(path)
+    return read_json_rows(path)
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# Loading
+def check_columns(table, columns):
+    allowed = LOADABLE_COLUMNS[table]
+    unknown = [column for column in columns if column not in allowed]
+    if unknown:
+        raise ValueError(f"{table}: unsupported column(s) {', '.join(unknown)}")
+
+
+def load_with_executemany(conn, table, path, batch_size, report):
+    """Insert rows in multi-row batches, committing once per batch"""
+    cursor = conn.cursor()
+    loaded = 0
+    columns = None
+    sql = None
+    try:
+        for batch in batched(read_rows(path), batch_size):
+            for row_columns, _ in batch:
+                if row_columns != columns:
+                    if columns is not None:
+                        raise ValueError(f"{path}: every record must have the same fields")
+                    check_columns(table, row_columns)
+                    columns = row_columns
+                    sql = (f"INSERT INTO {table} ({', '.join(columns)}) "
+                           f"VALUES ({', '.join(['%s'] * len(columns))})")
+            cursor.executemany(sql, [row for _, row in batch])
+            conn.commit()
+            loaded += len(batch)
+            report(loaded)
+    finally:
+        cursor.close()
+    return loaded
+
+
+def load_with_local_infile(conn, table, path, report):
+    """Hand a CSV file to LOAD DATA LOCAL INFILE (empty fields become NULL)"""
+    if not path.lower().endswith(".csv"):
+        raise ValueError(f"{path}: --local-infile only supports CSV files")
+    with open(path, newline="", encoding="utf-8") as f:
+        columns = tuple(next(csv.reader(f), ()))
+    if not columns:
+        raise ValueError(f"{path}: missing CSV header row")
+    check_columns(table, columns)
+
+    variables = [f"@c{i}" for i in range(len(columns))]
+    assignments = ", ".join(
+        f"{column} = NULLIF(TRIM(TRAILING '\\r' FROM {variable}), '')"
+        for column, variable in zip(columns, variables)
+    )
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} "
+            "CHARACTER SET utf8mb4 "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            "LINES TERMINATED BY '\\n' IGNORE 1 LINES "
+            f"({', '.join(variables)}) SET {assignments}",
+            (os.path.abspath(path),)
+        )
+        conn.commit()
+        loaded = cursor.rowcount
+    finally:
+        cursor.close()
+    report(loaded)
+    return loaded
+
+
+def set_trigger_bypass(conn, enabled):
+    """Switch the per-row aggregate, catalog card and feed triggers off (or back on) for this session"""
+    value = "1" if enabled else "NULL"
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SET @skip_review_triggers = {value}, @skip_like_triggers = {value}, "
+                       f"@skip_card_triggers = {value}, @skip_feed_triggers = {value}")
+    finally:
+        cursor.close()
+
+
+def recompute_aggregates(conn, tables):
+    """Rebuild everything the skipped triggers would have maintained, set-based"""
+    cursor = conn.cursor()
+    try:
+        if "Review_Likes" in tables:
+            cursor.execute(RECOUNT_LIKES_SQL)
+        cursor.callproc("reconcile_rating_aggregates")
+        titles_updated = sum(len(result.fetchall()) for result in cursor.stored_results())
+        cursor.callproc("rebuild_user_stats")
+        cursor.callproc("rebuild_feed_inbox")
+        conn.commit()
+        cursor.callproc("refresh_leaderboard", (True,))
+        cursor.callproc("rebuild_catalog_cards")
+        conn.commit()
+    finally:
+        cursor.close()
+    return titles_updated
+
+
+# Command line
+def add_connection_arguments(parser):
+    parser.add_argument("--secrets", default=SECRETS_PATH, help="secrets.toml with a [mysql] section")
+    for key in ("host", "user", "password", "database"):
+        parser.add_argument(f"--{key}")
+    parser.add_argument("--port", type=int)
+
+
+def connection_settings(args):
+    config = {}
+    if tomllib and os.path.exists(args.secrets):
+        with open(args.secrets, "rb") as f:
+            config = dict(tomllib.load(f).get("mysql", {}))
+    for key in ("host", "port", "user", "password", "database"):
+        value = getattr(args, key)
+        if value is not None:
+            config[key] = value
+    missing = [key for key in ("host", "user", "password", "database") if key not in config]
+    if missing:
+        raise SystemExit(f"Missing connection setting(s): {', '.join(missing)}")
+    return {
+        "host": config["host"],
+        "port": int(config.get("port", 3306)),
+        "user": config["user"],
+        "password": config["password"],
+        "database": config["database"],
+    }
+
+
+def parse_jobs(specs):
+    jobs = []
+    for spec in specs:
+        table, sep, path = spec.partition("=")
+        if not sep or not path:
+            raise SystemExit(f"Expected TABLE=PATH, got {spec!r}")
+        if table not in LOADABLE_COLUMNS:
+            raise SystemExit(f"Unknown table {table!r}; expected one of {', '.join(LOADABLE_COLUMNS)}")
+        jobs.append((table, path))
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load CSV / JSON Lines dumps into SIDRAMA")
+    parser.add_argument("jobs", nargs="+", metavar="TABLE=PATH", help="table and file to load, in order")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per executemany batch")
+    parser.add_argument("--local-infile", action="store_true",
+                        help="use LOAD DATA LOCAL INFILE for CSV files (server must allow local_infile)")
+    parser.add_argument("--skip-recompute", action="store_true",
+                        help="leave aggregates stale (run reconcile_rating_aggregates / rebuild_user_stats / "
+                             "rebuild_feed_inbox / rebuild_catalog_cards later)")
+    add_connection_arguments(parser)
+    args = parser.parse_args(argv)
+
+    jobs = parse_jobs(args.jobs)
+    conn = mysql.connector.connect(
+        **connection_settings(args),
+        autocommit=False,
+        allow_local_infile=args.local_infile
+    )
+    try:
+        set_trigger_bypass(conn, True)
+
+        overall_start = time.perf_counter()
+        total_rows = 0
+        for table, path in jobs:
+            start = time.perf_counter()
+
+            def report(loaded, table=table, start=start):
+                elapsed = time.perf_counter() - start
+                rate = loaded / elapsed if elapsed > 0 else 0.0
+                print(f"\r{table}: {loaded:,} rows ({rate:,.0f} rows/s)", end="", file=sys.stderr, flush=True)
+
+            if args.local_infile and path.lower().endswith(".csv"):
+                loaded = load_with_local_infile(conn, table, path, report)
+            else:
+                loaded = load_with_executemany(conn, table, path, args.batch_size, report)
+            elapsed = time.perf_counter() - start
+            print(file=sys.stderr)
+            print(f"{table}: loaded {loaded:,} rows from {path} in {elapsed:.1f}s "
+                  f"({loaded / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+            total_rows += loaded
+
+        set_trigger_bypass(conn, False)
+
+        touched = {table for table, _ in jobs}
+        if touched & AGGREGATE_SOURCES and not args.skip_recompute:
+            start = time.perf_counter()
+            titles_updated = recompute_aggregates(conn, touched)
+            print(f"Recomputed ratings, review counts, user_stats, feeds and catalog cards in {time.perf_counter() - start:.1f}s "
+                  f"({titles_updated:,} titles changed)")
+
+        elapsed = time.perf_counter() - overall_start
+        print(f"Total: {total_rows:,} rows in {elapsed:.1f}s ({total_rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+    except (mysql.connector.Error, ValueError, OSError) as e:
+        conn.rollback()
+        raise SystemExit(f"Load failed (batches already committed are kept): {e}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
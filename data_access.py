@@ -0,0 +1,76 @@
+"""Concurrent page loaders.
+
+A page usually needs several independent reads (a stats row, two top-N
+lists, ...). ConcurrentLoader runs them on a shared thread pool, each on its
+own pooled connection, and hands back one ResultBundle, so the page waits
+for the slowest query instead of the sum of all of them.
+
+Each task runs in a copy of the submitting thread's contextvars context,
+so per-rerun state such as the query log's current rerun follows the query
+into the worker. The module has no Streamlit dependency; tasks are plain
+callables.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResultBundle(dict):
+    """Task results keyed by name, plus per-task errors and timings.
+
+    A task that raised maps to None here and to its exception in errors.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.errors = {}
+        self.timings = {}
+        self.elapsed_ms = 0.0
+
+    @property
+    def serial_ms(self):
+        """What the same tasks would have taken one after another"""
+        return sum(self.timings.values())
+
+
+class ConcurrentLoader:
+    """Fan independent loader callables out over a bounded thread pool"""
+
+    def __init__(self, max_workers=4, wrap=None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="page-loader")
+        # Optional hook run around every task in its worker thread (e.g. to attach UI context)
+        self._wrap = wrap
+
+    @staticmethod
+    def _timed(fn, args):
+        started = time.perf_counter()
+        value = fn(*args)
+        return value, (time.perf_counter() - started) * 1000
+
+    def run(self, tasks, timeout=None, wrap=None):
+        """Run {name: fn or (fn, *args)} concurrently and wait for all of them.
+
+        timeout bounds the whole bundle; tasks still running when it expires
+        are reported in errors as TimeoutError and their results dropped.
+        """
+        wrap = wrap or self._wrap
+        started = time.perf_counter()
+        futures = {}
+        for name, task in tasks.items():
+            fn, *args = task if isinstance(task, tuple) else (task,)
+            if wrap is not None:
+                fn = wrap(fn)
+            futures[name] = self._pool.submit(contextvars.copy_context().run, self._timed, fn, args)
+
+        deadline = started + timeout if timeout is not None else None
+        bundle = ResultBundle()
+        for name, future in futures.items():
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                bundle[name], bundle.timings[name] = future.result(timeout=remaining)
+            except Exception as e:
+                future.cancel()
+                bundle[name] = None
+                bundle.errors[name] = e
+        bundle.elapsed_ms = (time.perf_counter() - started) * 1000
+        return bundle
@@ -0,0 +1,368 @@
+"""Streaming CSV / Parquet exports of large result sets.
+
+An export runs one SELECT on an unbuffered cursor, so the server streams rows
+instead of the client buffering the whole result, and pulls it in fixed-size
+chunks with fetchmany(). Each chunk becomes a typed pandas DataFrame that is
+appended to the output file (a CSV block or a Parquet row group) before the
+next chunk is read, so exporting millions of reviews holds one chunk in
+memory, not the result set.
+
+Column types come from the cursor description rather than from the data, so
+every chunk and every Parquet row group share one schema even when a chunk
+happens to be NULL throughout some column.
+
+    python exports.py user-reviews 42 --out reviews.parquet
+    python exports.py movie-reviews 7 --out reviews.csv
+    python exports.py catalog movies --genre Drama --min-rating 4 --out drama.csv
+
+Parquet output needs pyarrow (installed with Streamlit). The module has no
+Streamlit dependency; the app passes a progress callback.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import mysql.connector
+import pandas as pd
+from mysql.connector import FieldType
+
+import bulk_load
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV exports still work
+    pa = pq = None
+
+FORMATS = ("csv", "parquet")
+DEFAULT_CHUNK_SIZE = 10000
+# Seconds the server waits on a client that is busy writing a chunk (default 60)
+NET_WRITE_TIMEOUT = 600
+
+# What to run, and a cheap query for the expected row count (for progress)
+ExportQuery = namedtuple("ExportQuery", "name sql params count_sql count_params")
+
+
+# Export queries: each reads in index order, so rows stream without a filesort
+def user_reviews(user_id):
+    """Every review a user wrote, oldest first (idx_review_user_date)"""
+    return ExportQuery(
+        f"user_{user_id}_reviews",
+        """
+        SELECT
+            r.review_id,
+            r.date AS review_date,
+            CASE WHEN r.movie_id IS NOT NULL THEN 'Movie' ELSE 'TV Show Episode' END AS content_type,
+            r.movie_id,
+            e.show_id,
+            r.episode_id,
+            COALESCE(m.name, CONCAT(s.name, ' - S', e.season_number, 'E', e.episode_no)) AS content_name,
+            r.rating,
+            r.likes_count,
+            r.review_text
+        FROM Review r
+        LEFT JOIN Movie m ON r.movie_id = m.movie_id
+        LEFT JOIN Episode e ON r.episode_id = e.episode_id
+        LEFT JOIN tvshow s ON e.show_id = s.show_id
+        WHERE r.user_id = %s
+        ORDER BY r.date, r.review_id
+        """,
+        (user_id,),
+        "SELECT total_reviews FROM user_stats WHERE user_id = %s",
+        (user_id,)
+    )
+
+
+def movie_reviews(movie_id):
+    """Every review of a movie, oldest first (idx_review_movie_date)"""
+    return ExportQuery(
+        f"movie_{movie_id}_reviews",
+        """
+        SELECT
+            r.review_id,
+            r.date AS review_date,
+            u.username,
+            r.rating,
+            r.likes_count,
+            r.review_text
+        FROM Review r
+        JOIN User u ON r.user_id = u.user_id
+        WHERE r.movie_id = %s
+        ORDER BY r.date, r.review_id
+        """,
+        (movie_id,),
+        "SELECT total_reviews FROM Movie WHERE movie_id = %s",
+        (movie_id,)
+    )
+
+
+def show_reviews(show_id):
+    """Every review of a show's episodes, in episode order (idx_episode_show_order, idx_review_episode_date)"""
+    return ExportQuery(
+        f"show_{show_id}_reviews",
+        """
+        SELECT
+            r.review_id,
+            r.date AS review_date,
+            e.season_number,
+            e.episode_no,
+            e.title AS episode_title,
+            u.username,
+            r.rating,
+            r.likes_count,
+            r.review_text
+        FROM Episode e
+        JOIN Review r ON r.episode_id = e.episode_id
+        JOIN User u ON r.user_id = u.user_id
+        WHERE e.show_id = %s
+        ORDER BY e.season_number, e.episode_no, r.date, r.review_id
+        """,
+        (show_id,),
+        "SELECT total_reviews FROM tvshow WHERE show_id = %s",
+        (show_id,)
+    )
+
+
+CATALOG_COLUMNS = {
+    "movies": ("movie_card", "movie_id", "Movie_Genre",
+               "movie_id, name, release_date, language, age_rating, total_duration, box_office, "
+               "ratings, total_reviews, genres, directors, actors"),
+    "shows": ("show_card", "show_id", "Show_Genre",
+              "show_id, name, release_date, language, age_rating, num_of_seasons, num_of_episodes, "
+              "status, ratings, total_reviews, genres"),
+}
+
+
+def catalog_slice(kind, genre=None, language=None, min_rating=None, released_from=None, released_to=None):
+    """Catalog cards ("movies" or "shows") matching the filters, in primary key order"""
+    table, key, genre_table, columns = CATALOG_COLUMNS[kind]
+    conditions = []
+    params = []
+    if genre:
+        conditions.append(f"""EXISTS (
+            SELECT 1 FROM {genre_table} tg JOIN Genre g ON tg.genre_id = g.genre_id
+            WHERE tg.{key} = c.{key} AND g.name = %s
+        )""")
+        params.append(genre)
+    if language:
+        conditions.append("c.language = %s")
+        params.append(language)
+    if min_rating:
+        conditions.append("c.ratings >= %s")
+        params.append(min_rating)
+    if released_from:
+        conditions.append("c.release_date >= %s")
+        params.append(released_from)
+    if released_to:
+        conditions.append("c.release_date <= %s")
+        params.append(released_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    filters = "_".join(str(value) for value in params).replace(" ", "-")
+    return ExportQuery(
+        f"{kind}_{filters}" if filters else kind,
+        f"SELECT {columns} FROM {table} c {where} ORDER BY c.{key}",
+        tuple(params),
+        f"SELECT COUNT(*) FROM {table} c {where}",
+        tuple(params)
+    )
+
+
+# Typed chunks
+_INTEGER_TYPES = {"TINY", "SHORT", "LONG", "LONGLONG", "INT24", "YEAR"}
+_FLOAT_TYPES = {"DECIMAL", "NEWDECIMAL", "FLOAT", "DOUBLE"}
+_DATE_TYPES = {"DATE", "NEWDATE"}
+_DATETIME_TYPES = {"DATETIME", "TIMESTAMP"}
+
+
+def column_kinds(description):
+    """'int' / 'float' / 'date' / 'datetime' / 'string' per column of a cursor description"""
+    kinds = []
+    for column in description:
+        type_name = FieldType.get_info(column[1])
+        if type_name in _INTEGER_TYPES:
+            kinds.append("int")
+        elif type_name in _FLOAT_TYPES:
+            # DECIMAL ratings arrive as Decimal objects; float64 is exact enough for them
+            kinds.append("float")
+        elif type_name in _DATE_TYPES:
+            kinds.append("date")
+        elif type_name in _DATETIME_TYPES:
+            kinds.append("datetime")
+        else:
+            kinds.append("string")
+    return kinds
+
+
+_PANDAS_DTYPES = {"int": "Int64", "float": "Float64", "string": "string"}
+
+
+def to_frame(rows, columns, kinds):
+    """One fetched chunk as a DataFrame with nullable, description-derived dtypes"""
+    frame = pd.DataFrame.from_records(rows, columns=columns)
+    for column, kind in zip(columns, kinds):
+        if kind == "datetime":
+            frame[column] = pd.to_datetime(frame[column])
+        elif kind != "date":  # dates stay datetime.date objects, which both writers handle
+            frame[column] = frame[column].astype(_PANDAS_DTYPES[kind])
+    return frame
+
+
+def arrow_schema(columns, kinds):
+    types = {"int": pa.int64(), "float": pa.float64(), "date": pa.date32(),
+             "datetime": pa.timestamp("us"), "string": pa.string()}
+    return pa.schema([(column, types[kind]) for column, kind in zip(columns, kinds)])
+
+
+# Writers: open once, append one chunk at a time
+class CsvChunkWriter:
+    def __init__(self, path, columns, kinds):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        # Header up front, so an empty export is still a valid CSV
+        pd.DataFrame(columns=columns).to_csv(self._file, index=False)
+
+    def write(self, frame):
+        frame.to_csv(self._file, index=False, header=False)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetChunkWriter:
+    def __init__(self, path, columns, kinds):
+        self._schema = arrow_schema(columns, kinds)
+        self._writer = pq.ParquetWriter(path, self._schema, compression="snappy")
+
+    def write(self, frame):
+        # One row group per chunk
+        self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {"csv": CsvChunkWriter, "parquet": ParquetChunkWriter}
+
+
+def expected_rows(conn, query):
+    """Row count estimate for progress reporting; None if unknown"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query.count_sql, query.count_params)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    return rows[0][0] if rows and rows[0][0] is not None else None
+
+
+def stream_export(conn, query, path, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Stream query into path chunk by chunk; returns {"rows", "chunks", "seconds", "bytes"}.
+
+    progress(rows_written, expected_rows) is called after every chunk;
+    expected_rows comes from the stored aggregates and may be None or slightly
+    off while reviews are being written.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    if fmt == "parquet" and pq is None:
+        raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+    started = time.perf_counter()
+    total = expected_rows(conn, query)
+
+    cursor = conn.cursor(buffered=False)
+    writer = None
+    written = chunks = 0
+    exhausted = False
+    try:
+        cursor.execute(f"SET SESSION net_write_timeout = {NET_WRITE_TIMEOUT}")
+        cursor.execute(query.sql, query.params)
+        columns = list(cursor.column_names)
+        kinds = column_kinds(cursor.description)
+        writer = WRITERS[fmt](path, columns, kinds)
+        if progress:
+            progress(0, total)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                exhausted = True
+                break
+            writer.write(to_frame(rows, columns, kinds))
+            written += len(rows)
+            chunks += 1
+            if progress:
+                progress(written, total)
+    finally:
+        if writer is not None:
+            writer.close()
+        if not exhausted and cursor.with_rows:
+            # An unbuffered result must be read to the end before the connection is reused;
+            # drain it a chunk at a time rather than with fetchall()
+            try:
+                while cursor.fetchmany(chunk_size):
+                    pass
+            except mysql.connector.Error:
+                pass
+        try:
+            # The connection goes back to a pool; don't leave the long timeout on it
+            cursor.execute("SET SESSION net_write_timeout = DEFAULT")
+        except mysql.connector.Error:
+            pass
+        cursor.close()
+    return {"rows": written, "chunks": chunks, "seconds": time.perf_counter() - started,
+            "bytes": os.path.getsize(path)}
+
+
+# Command line
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream SIDRAMA reviews or catalog slices to CSV / Parquet")
+    sources = parser.add_subparsers(dest="source", required=True)
+
+    for source, noun, help_text in (("user-reviews", "user", "every review one user wrote"),
+                                    ("movie-reviews", "movie", "every review of one movie"),
+                                    ("show-reviews", "show", "every review of one show's episodes")):
+        sub = sources.add_parser(source, help=help_text)
+        sub.add_argument("id", type=int, help=f"{noun} id")
+
+    catalog = sources.add_parser("catalog", help="movie or show cards matching filters")
+    catalog.add_argument("kind", choices=sorted(CATALOG_COLUMNS))
+    catalog.add_argument("--genre")
+    catalog.add_argument("--language")
+    catalog.add_argument("--min-rating", type=float)
+    catalog.add_argument("--released-from", help="YYYY-MM-DD")
+    catalog.add_argument("--released-to", help="YYYY-MM-DD")
+
+    for sub in sources.choices.values():
+        sub.add_argument("--out", required=True, help="output file; .parquet selects Parquet unless --format is given")
+        sub.add_argument("--format", choices=FORMATS)
+        sub.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per fetch / row group")
+        bulk_load.add_connection_arguments(sub)
+    args = parser.parse_args(argv)
+
+    if args.source == "catalog":
+        query = catalog_slice(args.kind, args.genre, args.language, args.min_rating,
+                              args.released_from, args.released_to)
+    else:
+        query = {"user-reviews": user_reviews, "movie-reviews": movie_reviews,
+                 "show-reviews": show_reviews}[args.source](args.id)
+    fmt = args.format or ("parquet" if args.out.lower().endswith(".parquet") else "csv")
+
+    conn = mysql.connector.connect(**bulk_load.connection_settings(args))
+    try:
+        def report(written, total):
+            of_total = f" of ~{total:,}" if total else ""
+            print(f"\r{query.name}: {written:,}{of_total} rows", end="", file=sys.stderr, flush=True)
+
+        result = stream_export(conn, query, args.out, fmt, args.chunk_size, report)
+        print(file=sys.stderr)
+        print(f"Wrote {result['rows']:,} rows in {result['chunks']:,} chunks to {args.out} "
+              f"({result['bytes'] / 1e6:,.1f} MB) in {result['seconds']:.1f}s "
+              f"({result['rows'] / result['seconds'] if result['seconds'] > 0 else 0:,.0f} rows/s)")
+    except (mysql.connector.Error, ValueError, OSError) as e:
+        raise SystemExit(f"Export failed: {e}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""Synthetic dataset generator for load testing.
+
+Writes one CSV per table (plus manifest.json with the load order and row
+counts) in the format bulk_load.py reads:
+
+    python generate_data.py data/medium --scale medium
+    python generate_data.py data/custom --users 100000 --movies 50000 --reviews 10000000
+    python bulk_load.py $(python generate_data.py data/small --scale small --print-jobs)
+
+Output is deterministic for a given seed and --today. Popularity is skewed:
+a few titles collect most reviews, a few users write most of them, and a few
+reviewers attract most likes and followers. Generation streams row by row, so memory
+stays flat even at ten million reviews.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+from datetime import date, timedelta
+
+SCALES = {
+    "small": dict(users=1_000, movies=500, shows=50, actors=2_000, directors=300,
+                  reviews=20_000, likes=20_000, follows=5_000),
+    "medium": dict(users=20_000, movies=10_000, shows=1_000, actors=20_000, directors=3_000,
+                   reviews=1_000_000, likes=1_000_000, follows=200_000),
+    "large": dict(users=100_000, movies=50_000, shows=5_000, actors=100_000, directors=10_000,
+                  reviews=10_000_000, likes=5_000_000, follows=1_000_000),
+}
+
+GENRES = ("Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama",
+          "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance",
+          "Science Fiction", "Thriller", "War", "Western")
+LANGUAGES = (("English", 60), ("Hindi", 10), ("Spanish", 8), ("French", 6), ("Japanese", 6),
+             ("Korean", 5), ("Tamil", 3), ("German", 2))
+AGE_RATINGS = ("G", "PG", "PG-13", "R", "U", "UA", "A", "TV-14", "TV-MA")
+SHOW_STATUSES = ("Ongoing", "Completed", "Cancelled")
+TITLE_WORDS = ("silent", "river", "midnight", "empire", "shadow", "last", "golden", "storm",
+               "city", "garden", "broken", "signal", "winter", "echo", "crimson", "harbor",
+               "iron", "dream", "lost", "kingdom", "paper", "moon", "wild", "hidden", "fire",
+               "glass", "ocean", "secret", "northern", "light", "machine", "return", "stranger",
+               "violet", "orbit", "desert", "legacy", "whisper", "thunder", "horizon")
+FIRST_NAMES = ("Aarav", "Maya", "Liam", "Sofia", "Noah", "Priya", "Mateo", "Yuki", "Chen",
+               "Amara", "Lucas", "Zara", "Ethan", "Ines", "Omar", "Hana", "Leo", "Nia",
+               "Ravi", "Elena", "Kofi", "Sara", "Jonas", "Aiko", "Diego", "Lena")
+LAST_NAMES = ("Sharma", "Garcia", "Kim", "Okafor", "Rossi", "Nakamura", "Silva", "Muller",
+              "Khan", "Dubois", "Novak", "Iyer", "Larsen", "Haddad", "Costa", "Walker",
+              "Mensah", "Ivanova", "Tanaka", "Reyes", "Fischer", "Patel", "Moreau", "Berg")
+
+LOAD_ORDER = ("Genre", "User", "Movie", "tvshow", "Episode", "Actor", "Director",
+              "Movie_Genre", "Show_Genre", "Movie_Director", "Movie_Actor",
+              "User_Followers", "Review", "Review_Likes")
+
+
+# Skewed sampling
+def skewed_index(rng, n, skew):
+    """Index in [0, n) where low indexes are far more likely (skew=1 is uniform)"""
+    return min(int(n * rng.random() ** skew), n - 1)
+
+
+def popularity_order(rng, n):
+    """Random permutation of 1..n: popularity rank -> entity id"""
+    ids = list(range(1, n + 1))
+    rng.shuffle(ids)
+    return ids
+
+
+def activity_counts(rng, n, total, alpha=1.2):
+    """Split total across n entities with Pareto-distributed weights"""
+    weights = [rng.paretovariate(alpha) for _ in range(n)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    # Hand the rounding remainder to random entities so the total is exact
+    for _ in range(total - sum(counts)):
+        counts[rng.randrange(n)] += 1
+    return counts
+
+
+def random_date(rng, start_year, end):
+    start = date(start_year, 1, 1)
+    return start + timedelta(days=rng.randrange((end - start).days))
+
+
+def title(rng, words=2):
+    return " ".join(rng.choice(TITLE_WORDS).capitalize() for _ in range(words))
+
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def sentence(rng, words=12):
+    return " ".join(rng.choice(TITLE_WORDS) for _ in range(words)).capitalize() + "."
+
+
+# Writer
+class TableWriter:
+    """CSV writer that tracks row counts for the manifest"""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.counts = {}
+
+    def write(self, table, columns, rows):
+        path = os.path.join(self.out_dir, f"{table}.csv")
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow("" if value is None else value for value in row)
+                count += 1
+        self.counts[table] = count
+
+
+def distinct_targets(rng, count, pick, limit):
+    """Up to count distinct values drawn with pick(); gives up after repeated collisions"""
+    chosen = set()
+    attempts = 0
+    count = min(count, limit)
+    while len(chosen) < count and attempts < count * 10:
+        chosen.add(pick())
+        attempts += 1
+    return chosen
+
+
+# Generator
+def generate(out_dir, users, movies, shows, actors, directors, reviews, likes, follows,
+             seed=42, movie_share=0.7, today=None):
+    """Write a full dataset to out_dir and return the manifest
+
+    Review and release dates are relative to today, so pass the same today
+    (and seed) to reproduce a dataset exactly.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    os.makedirs(out_dir, exist_ok=True)
+    out = TableWriter(out_dir)
+
+    languages = [name for name, _ in LANGUAGES]
+    language_weights = [weight for _, weight in LANGUAGES]
+
+    out.write("Genre", ("genre_id", "name", "description"),
+              ((i, name, f"{name} titles") for i, name in enumerate(GENRES, start=1)))
+
+    out.write("User", ("user_id", "username", "password", "name", "dob", "email", "ph_no", "address"),
+              ((i, f"user{i}", "password", person_name(rng), random_date(rng, 1960, date(2007, 1, 1)),
+                f"user{i}@example.com", f"9{rng.randrange(10**9):09d}", f"{rng.randrange(1, 999)} Main Street")
+               for i in range(1, users + 1)))
+
+    # Per-title quality drives the rating distribution
+    movie_quality = [rng.uniform(1.5, 4.6) for _ in range(movies + 1)]
+    out.write("Movie", ("movie_id", "name", "total_duration", "descr", "box_office", "release_date",
+                        "age_rating", "language", "poster_url"),
+              ((i, f"{title(rng, rng.randint(1, 3))} {i}", rng.randint(80, 180), sentence(rng),
+                int(rng.lognormvariate(16, 1.5)), random_date(rng, 1950, today),
+                rng.choice(AGE_RATINGS), rng.choices(languages, language_weights)[0], None)
+               for i in range(1, movies + 1)))
+
+    # Episodes are numbered show by show, season by season
+    show_quality = [rng.uniform(1.5, 4.6) for _ in range(shows + 1)]
+    show_seasons = [0] + [rng.randint(1, 8) for _ in range(shows)]
+    season_lengths = [[]] + [[rng.randint(6, 13) for _ in range(show_seasons[i])] for i in range(1, shows + 1)]
+    out.write("tvshow", ("show_id", "name", "num_of_seasons", "num_of_episodes", "descr", "release_date",
+                         "age_rating", "language", "poster_url", "status"),
+              ((i, f"{title(rng, rng.randint(1, 3))} {i}", show_seasons[i], sum(season_lengths[i]),
+                sentence(rng), random_date(rng, 1980, today), rng.choice(AGE_RATINGS),
+                rng.choices(languages, language_weights)[0], None, rng.choice(SHOW_STATUSES))
+               for i in range(1, shows + 1)))
+
+    episode_show = [0]
+
+    def episode_rows():
+        episode_id = 0
+        for show_id in range(1, shows + 1):
+            air_date = random_date(rng, 1980, today)
+            for season, length in enumerate(season_lengths[show_id], start=1):
+                for episode_no in range(1, length + 1):
+                    episode_id += 1
+                    episode_show.append(show_id)
+                    air_date = min(air_date + timedelta(days=7), today)
+                    yield (episode_id, show_id, season, episode_no, sentence(rng), rng.randint(20, 60),
+                           air_date, f"{title(rng)} (S{season}E{episode_no})")
+
+    out.write("Episode", ("episode_id", "show_id", "season_number", "episode_no", "ep_descr", "duration",
+                          "air_date", "title"), episode_rows())
+    episodes = len(episode_show) - 1
+
+    out.write("Actor", ("actor_id", "name", "dob", "gender", "bio", "profile_image_url"),
+              ((i, person_name(rng), random_date(rng, 1930, date(2010, 1, 1)), rng.choice(("Male", "Female")),
+                sentence(rng), None) for i in range(1, actors + 1)))
+    out.write("Director", ("director_id", "name", "dob", "gender", "bio", "profile_image_url", "nationality"),
+              ((i, person_name(rng), random_date(rng, 1930, date(1995, 1, 1)), rng.choice(("Male", "Female")),
+                sentence(rng), None, rng.choice(("Indian", "American", "British", "French", "Korean", "Japanese")))
+               for i in range(1, directors + 1)))
+
+    out.write("Movie_Genre", ("movie_id", "genre_id"),
+              ((movie_id, genre_id) for movie_id in range(1, movies + 1)
+               for genre_id in sorted(rng.sample(range(1, len(GENRES) + 1), rng.randint(1, 3)))))
+    out.write("Show_Genre", ("show_id", "genre_id"),
+              ((show_id, genre_id) for show_id in range(1, shows + 1)
+               for genre_id in sorted(rng.sample(range(1, len(GENRES) + 1), rng.randint(1, 3)))))
+
+    director_rank = popularity_order(rng, directors)
+    out.write("Movie_Director", ("movie_id", "director_id"),
+              ((movie_id, director_id) for movie_id in range(1, movies + 1)
+               for director_id in sorted(distinct_targets(
+                   rng, 1 + (rng.random() < 0.1),
+                   lambda: director_rank[skewed_index(rng, directors, 2)], directors))))
+
+    actor_rank = popularity_order(rng, actors)
+    out.write("Movie_Actor", ("movie_id", "actor_id", "character_name"),
+              ((movie_id, actor_id, person_name(rng)) for movie_id in range(1, movies + 1)
+               for actor_id in sorted(distinct_targets(
+                   rng, rng.randint(3, 8), lambda: actor_rank[skewed_index(rng, actors, 2)], actors))))
+
+    # A few users attract most followers (and, below, most likes)
+    user_rank = popularity_order(rng, users)
+
+    def follow_rows():
+        for follower_id, count in enumerate(activity_counts(rng, users, follows), start=1):
+            targets = distinct_targets(rng, count, lambda: user_rank[skewed_index(rng, users, 3)], users - 1)
+            for following_id in sorted(targets - {follower_id}):
+                yield follower_id, following_id
+
+    out.write("User_Followers", ("follower_id", "following_id"), follow_rows())
+
+    movie_rank = popularity_order(rng, movies) if movies else []
+    episode_rank = popularity_order(rng, episodes) if episodes else []
+    movie_share = movie_share if episodes else 1.0
+    movie_share = movie_share if movies else 0.0
+
+    def rating_for(quality):
+        return max(0.0, min(5.0, round(rng.gauss(quality, 0.9) * 2) / 2))
+
+    def review_rows():
+        review_id = 0
+        for user_id, count in enumerate(activity_counts(rng, users, reviews), start=1):
+            movie_count = sum(rng.random() < movie_share for _ in range(count))
+            movie_ids = distinct_targets(rng, movie_count, lambda: movie_rank[skewed_index(rng, movies, 3)], movies)
+            episode_ids = distinct_targets(rng, count - movie_count,
+                                           lambda: episode_rank[skewed_index(rng, episodes, 3)], episodes)
+            for movie_id in movie_ids:
+                review_id += 1
+                # Recent dates are more common than old ones
+                yield (review_id, user_id, movie_id, None,
+                       today - timedelta(days=skewed_index(rng, 3 * 365, 2)),
+                       rating_for(movie_quality[movie_id]), sentence(rng, rng.randint(5, 30)))
+            for episode_id in episode_ids:
+                review_id += 1
+                yield (review_id, user_id, None, episode_id,
+                       today - timedelta(days=skewed_index(rng, 3 * 365, 2)),
+                       rating_for(show_quality[episode_show[episode_id]]), sentence(rng, rng.randint(5, 30)))
+
+    out.write("Review", ("review_id", "user_id", "movie_id", "episode_id", "date", "rating", "review_text"),
+              review_rows())
+    total_reviews = out.counts["Review"]
+
+    def like_rows():
+        if not total_reviews:
+            return
+        for user_id, count in enumerate(activity_counts(rng, users, likes), start=1):
+            targets = distinct_targets(rng, count, lambda: 1 + skewed_index(rng, total_reviews, 3), total_reviews)
+            for review_id in sorted(targets):
+                yield review_id, user_id
+
+    out.write("Review_Likes", ("review_id", "user_id"), like_rows())
+
+    manifest = {
+        "seed": seed,
+        "today": today.isoformat(),
+        "parameters": dict(users=users, movies=movies, shows=shows, actors=actors, directors=directors,
+                           reviews=reviews, likes=likes, follows=follows),
+        "load_order": [table for table in LOAD_ORDER if table in out.counts],
+        "rows": out.counts,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_jobs(out_dir, manifest):
+    """TABLE=PATH arguments for bulk_load.py, in load order"""
+    return [f"{table}={os.path.join(out_dir, table + '.csv')}" for table in manifest["load_order"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic SIDRAMA dataset as CSV files")
+    parser.add_argument("out_dir")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--today", type=date.fromisoformat, help="anchor date for generated dates (default: today)")
+    for key in SCALES["small"]:
+        parser.add_argument(f"--{key}", type=int, help=f"override the scale's {key} count")
+    parser.add_argument("--print-jobs", action="store_true", help="print bulk_load.py arguments only")
+    args = parser.parse_args(argv)
+
+    sizes = dict(SCALES[args.scale])
+    for key in sizes:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+    manifest = generate(args.out_dir, seed=args.seed, today=args.today, **sizes)
+    if args.print_jobs:
+        print(" ".join(load_jobs(args.out_dir, manifest)))
+    else:
+        for table in manifest["load_order"]:
+            print(f"{table}: {manifest['rows'][table]:,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Local disk cache for poster and profile images.
+
+Remote images are downloaded once and stored content-addressed (by the
+SHA-256 of their bytes), and fixed-size thumbnails are generated for list
+views, so pages serve small local files instead of hot-linking full-size
+remote posters on every rerun.
+
+The module has no Streamlit dependency. Its self-check points an ImageCache
+at a temporary directory and at URLs served by a local ``http.server``, so it
+runs offline:
+
+    python image_cache.py --requests 50
+"""
+import argparse
+import functools
+import hashlib
+import http.server
+import io
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from PIL import Image, ImageOps
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+PLACEHOLDER_PATH = os.path.join(ASSETS_DIR, "no_poster.png")
+
+
+class ImageCache:
+    """Download-once, content-addressed image store with thumbnail generation"""
+
+    def __init__(self, cache_dir, thumb_size=(200, 300), timeout=5.0,
+                 max_bytes=10 * 1024 * 1024, retry_after=3600, max_workers=8, lock_stripes=64):
+        self.cache_dir = cache_dir
+        self.thumb_size = tuple(thumb_size)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.retry_after = retry_after
+        self.max_workers = max_workers
+        # A fixed set of locks shared out by URL hash, so memory does not grow with the catalog
+        self._locks = [threading.Lock() for _ in range(lock_stripes)]
+        for sub in ("originals", "thumbs", "urls"):
+            os.makedirs(os.path.join(cache_dir, sub), exist_ok=True)
+
+    # Paths
+    def _url_key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _url_record(self, url):
+        return os.path.join(self.cache_dir, "urls", self._url_key(url))
+
+    def _original_path(self, digest):
+        return os.path.join(self.cache_dir, "originals", f"{digest}.img")
+
+    def _thumb_path(self, digest):
+        width, height = self.thumb_size
+        return os.path.join(self.cache_dir, "thumbs", f"{digest}_{width}x{height}.jpg")
+
+    def _lock_for(self, url):
+        return self._locks[int(self._url_key(url)[:8], 16) % len(self._locks)]
+
+    def _write_record(self, record, digest):
+        # Replaced atomically: the lock-free read in _digest_for must never see it half written
+        tmp = f"{record}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            f.write(digest)
+        os.replace(tmp, record)
+
+    # Download
+    def _download(self, url):
+        """Fetch url and return its bytes, or None if it is unusable"""
+        if urlparse(url).scheme not in ("http", "https"):
+            return None
+        request = urllib.request.Request(url, headers={"User-Agent": "SIDRAMA-image-cache"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            data = response.read(self.max_bytes + 1)
+        if len(data) > self.max_bytes:
+            return None
+        # Reject anything Pillow cannot decode before it reaches the cache
+        Image.open(io.BytesIO(data)).verify()
+        return data
+
+    def _digest_for(self, url):
+        """Content digest for url, downloading it on first use; None if unavailable"""
+        record = self._url_record(url)
+        if os.path.exists(record):
+            with open(record) as f:
+                digest = f.read().strip()
+            if digest:
+                return digest
+            # Empty record marks a failed download; retry once it is old enough
+            if time.time() - os.path.getmtime(record) < self.retry_after:
+                return None
+
+        with self._lock_for(url):
+            if os.path.exists(record) and os.path.getsize(record):
+                with open(record) as f:
+                    return f.read().strip()
+            try:
+                data = self._download(url)
+            except Exception:
+                data = None
+            if data is None:
+                self._write_record(record, "")
+                return None
+
+            digest = hashlib.sha256(data).hexdigest()
+            original = self._original_path(digest)
+            if not os.path.exists(original):
+                tmp = f"{original}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, original)
+            self._write_record(record, digest)
+            return digest
+
+    # Public API
+    def original(self, url):
+        """Local path of the full-size image, or the placeholder"""
+        digest = self._digest_for(url) if url else None
+        return self._original_path(digest) if digest else PLACEHOLDER_PATH
+
+    def thumbnail(self, url):
+        """Local path of a thumb_size thumbnail (cropped to fill), or the placeholder"""
+        digest = self._digest_for(url) if url else None
+        if not digest:
+            return PLACEHOLDER_PATH
+        thumb = self._thumb_path(digest)
+        if not os.path.exists(thumb):
+            try:
+                with Image.open(self._original_path(digest)) as img:
+                    fitted = ImageOps.fit(img.convert("RGB"), self.thumb_size, Image.LANCZOS)
+                tmp = f"{thumb}.{threading.get_ident()}.tmp"
+                fitted.save(tmp, "JPEG", quality=85, optimize=True)
+                os.replace(tmp, thumb)
+            except Exception:
+                return PLACEHOLDER_PATH
+        return thumb
+
+    def prefetch(self, urls, thumbnails=True):
+        """Warm the cache for a page of URLs concurrently and wait for completion"""
+        pending = [url for url in set(urls) if url and not os.path.exists(self._url_record(url))]
+        if not pending:
+            return
+        fetch = self.thumbnail if thumbnails else self.original
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+            list(pool.map(fetch, pending))
+
+
+# Offline self-check
+def _expect(condition, what):
+    if not condition:
+        raise AssertionError(what)
+
+
+def self_check(requests=20):
+    """Exercise an ImageCache against a local http.server in a temporary directory"""
+    hits = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    with tempfile.TemporaryDirectory() as root:
+        served = os.path.join(root, "served")
+        os.makedirs(served)
+        Image.new("RGB", (600, 900), (180, 40, 40)).save(os.path.join(served, "poster.png"))
+        with open(os.path.join(served, "broken.png"), "wb") as f:
+            f.write(b"not an image")
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(Handler, directory=served))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            base = f"http://127.0.0.1:{server.server_port}"
+            cache = ImageCache(os.path.join(root, "cache"), timeout=2.0)
+            poster = f"{base}/poster.png"
+
+            # Concurrent first renders share one download and all get the thumbnail
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                thumbs = set(pool.map(cache.thumbnail, [poster] * requests))
+            _expect(len(thumbs) == 1 and PLACEHOLDER_PATH not in thumbs, f"concurrent thumbnails: {thumbs}")
+            _expect(hits.count("/poster.png") == 1, f"poster downloaded {hits.count('/poster.png')} times")
+            with Image.open(thumbs.pop()) as img:
+                _expect(img.size == cache.thumb_size, f"thumbnail size {img.size}")
+
+            # Undecodable, missing and non-http URLs get the placeholder and are not retried at once
+            for url in (f"{base}/broken.png", f"{base}/missing.png", "file:///etc/hostname"):
+                for _ in range(2):
+                    _expect(cache.original(url) == PLACEHOLDER_PATH, f"{url} was cached")
+            _expect(hits.count("/broken.png") == 1 and hits.count("/missing.png") == 1, "failed URLs retried early")
+
+            # A new instance on the same directory serves the poster from disk
+            _expect(ImageCache(cache.cache_dir).original(poster) != PLACEHOLDER_PATH, "poster lost on restart")
+            _expect(hits.count("/poster.png") == 1, "poster downloaded again after restart")
+        finally:
+            server.shutdown()
+            server.server_close()
+    return len(hits)
+
+
+# Command line
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the image cache offline against a local HTTP server")
+    parser.add_argument("--requests", type=int, default=20, help="concurrent first renders of one poster")
+    args = parser.parse_args(argv)
+    try:
+        downloads = self_check(args.requests)
+    except AssertionError as e:
+        raise SystemExit(f"Image cache self-check failed: {e}")
+    print(f"Image cache self-check passed ({args.requests} concurrent renders, {downloads} HTTP requests)")
+
+
+if __name__ == "__main__":
+    main()
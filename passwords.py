@@ -0,0 +1,254 @@
+"""Password hashing with scrypt and a bounded verification pool.
+
+Hashes are stored in the existing User.password column as
+
+    scrypt$<log2 N>$<r>$<p>$<salt b64>$<hash b64>
+
+Rows that still hold a plaintext password are recognised by the missing
+prefix, checked in constant time and re-hashed on the next successful login
+(or all at once with the ``migrate`` command). Hashes made with an older
+cost are upgraded the same way.
+
+scrypt is CPU- and memory-heavy on purpose, so the app never runs it on a
+script thread: PasswordHasher hands it to a small worker pool and refuses new
+work once ``max_pending`` verifications are queued, instead of letting a login
+storm pile up. The module has no Streamlit dependency:
+
+    python passwords.py bench --costs 12,14,15 --logins 200
+    python passwords.py migrate --batch-size 500
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+import mysql.connector
+
+import bulk_load
+
+PREFIX = "scrypt"
+DEFAULT_COST = 14  # N = 2**14: ~16 MiB and tens of milliseconds per hash
+DEFAULT_R = 8
+DEFAULT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class LoginBusy(Exception):
+    """Raised when the hashing pool already has max_pending requests, or one outlasts the timeout"""
+
+
+def _scrypt(password, salt, cost, r, p):
+    n = 1 << cost
+    # OpenSSL's default 32 MiB limit is too small from N = 2**15 upwards
+    maxmem = 128 * r * (n + p + 2) + 1024 * 1024
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+                          maxmem=maxmem, dklen=KEY_BYTES)
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def hash_password(password, cost=DEFAULT_COST, r=DEFAULT_R, p=DEFAULT_P, salt=None):
+    """Hash password into the storable scrypt$... form"""
+    salt = salt if salt is not None else os.urandom(SALT_BYTES)
+    key = _scrypt(password, salt, cost, r, p)
+    return f"{PREFIX}${cost}${r}${p}${_b64(salt)}${_b64(key)}"
+
+
+def parse_hash(stored):
+    """(cost, r, p, salt, key) for a scrypt$... value, or None for a legacy plaintext row"""
+    parts = stored.split("$") if stored else []
+    if len(parts) != 6 or parts[0] != PREFIX:
+        return None
+    try:
+        return (int(parts[1]), int(parts[2]), int(parts[3]),
+                base64.b64decode(parts[4]), base64.b64decode(parts[5]))
+    except ValueError:
+        return None
+
+
+def verify_password(password, stored, cost=DEFAULT_COST, r=DEFAULT_R, p=DEFAULT_P):
+    """Check password against a stored value; returns (matches, needs_rehash).
+
+    needs_rehash is True for plaintext rows and for hashes made with other
+    cost parameters, so callers can upgrade them after a successful login.
+    """
+    parsed = parse_hash(stored)
+    if parsed is None:
+        matches = hmac.compare_digest((password or "").encode("utf-8"), (stored or "").encode("utf-8"))
+        return matches, True
+    stored_cost, stored_r, stored_p, salt, key = parsed
+    matches = hmac.compare_digest(_scrypt(password, salt, stored_cost, stored_r, stored_p), key)
+    return matches, (stored_cost, stored_r, stored_p) != (cost, r, p)
+
+
+class PasswordHasher:
+    """scrypt hashing and verification on a bounded worker pool"""
+
+    def __init__(self, cost=DEFAULT_COST, r=DEFAULT_R, p=DEFAULT_P, max_workers=2, max_pending=16, timeout=10.0):
+        self.cost = cost
+        self.r = r
+        self.p = p
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Verified against when the username does not exist, so both paths cost the same
+        self._dummy_hash = hash_password("", cost, r, p)
+        self.metrics = {"verified": 0, "hashed": 0, "rejected_busy": 0, "timed_out": 0}
+        self._metrics_lock = threading.Lock()
+
+    def _run(self, counter, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._metrics_lock:
+                self.metrics["rejected_busy"] += 1
+            raise LoginBusy("Too many sign-ins in progress")
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            result = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The hash keeps its slot until it finishes; the caller just stops waiting
+            with self._metrics_lock:
+                self.metrics["timed_out"] += 1
+            raise LoginBusy("Sign-in is taking too long") from None
+        with self._metrics_lock:
+            self.metrics[counter] += 1
+        return result
+
+    def hash(self, password):
+        """Hash a new password at the configured cost"""
+        return self._run("hashed", hash_password, password, self.cost, self.r, self.p)
+
+    def verify(self, password, stored):
+        """(matches, needs_rehash) for stored; pass None for an unknown user"""
+        if stored is None:
+            self._run("verified", verify_password, password, self._dummy_hash, self.cost, self.r, self.p)
+            return False, False
+        return self._run("verified", verify_password, password, stored, self.cost, self.r, self.p)
+
+
+# Command line
+def benchmark_costs(costs, logins, clients, max_workers, password="benchmark-password"):
+    """Logins per second through a PasswordHasher at each cost, with concurrent clients"""
+    results = []
+    for cost in costs:
+        hasher = PasswordHasher(cost=cost, max_workers=max_workers, max_pending=clients, timeout=600)
+        stored = hash_password(password, cost)
+        latencies = []
+        latencies_lock = threading.Lock()
+        remaining = iter(range(logins))
+        remaining_lock = threading.Lock()
+
+        def client():
+            while True:
+                with remaining_lock:
+                    if next(remaining, None) is None:
+                        return
+                start = time.perf_counter()
+                hasher.verify(password, stored)
+                with latencies_lock:
+                    latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        latencies.sort()
+        results.append({
+            "cost": cost,
+            "logins_per_s": round(logins / elapsed, 1),
+            "median_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+            "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+        })
+    return results
+
+
+def migrate_plaintext(conn, cost, batch_size, report):
+    """Hash every remaining plaintext password, committing once per batch"""
+    cursor = conn.cursor()
+    migrated = 0
+    last_user_id = 0
+    try:
+        while True:
+            cursor.execute(
+                "SELECT user_id, password FROM User WHERE user_id > %s AND password NOT LIKE %s "
+                "ORDER BY user_id LIMIT %s",
+                (last_user_id, f"{PREFIX}$%", batch_size)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return migrated
+            # Compare-and-set, so a password changed meanwhile is left alone
+            cursor.executemany(
+                "UPDATE User SET password = %s WHERE user_id = %s AND password = %s",
+                [(hash_password(password, cost), user_id, password) for user_id, password in rows]
+            )
+            conn.commit()
+            migrated += len(rows)
+            last_user_id = rows[-1][0]
+            report(migrated)
+    finally:
+        cursor.close()
+
+
+def parse_costs(text):
+    return [int(cost) for cost in text.split(",") if cost.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Password hashing tools for SIDRAMA")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    bench = commands.add_parser("bench", help="measure logins per second at each scrypt cost")
+    bench.add_argument("--costs", type=parse_costs, default=[12, 13, 14, 15], help="log2 N values, comma separated")
+    bench.add_argument("--logins", type=int, default=100, help="verifications per cost")
+    bench.add_argument("--clients", type=int, default=8, help="concurrent login attempts")
+    bench.add_argument("--workers", type=int, default=2, help="verification pool size")
+
+    migrate = commands.add_parser("migrate", help="hash every plaintext password in the User table")
+    migrate.add_argument("--cost", type=int, default=DEFAULT_COST, help="log2 N for the new hashes")
+    migrate.add_argument("--batch-size", type=int, default=500)
+
+    bulk_load.add_connection_arguments(migrate)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        print(f"{'cost':>4}  {'N':>8}  {'logins/s':>9}  {'median ms':>9}  {'p95 ms':>8}")
+        for row in benchmark_costs(args.costs, args.logins, args.clients, args.workers):
+            print(f"{row['cost']:>4}  {1 << row['cost']:>8}  {row['logins_per_s']:>9}  "
+                  f"{row['median_ms']:>9}  {row['p95_ms']:>8}")
+        return
+
+    conn = mysql.connector.connect(**bulk_load.connection_settings(args), autocommit=False)
+    try:
+        start = time.perf_counter()
+
+        def report(migrated):
+            print(f"\rMigrated {migrated:,} passwords", end="", file=sys.stderr, flush=True)
+
+        migrated = migrate_plaintext(conn, args.cost, args.batch_size, report)
+        print(file=sys.stderr)
+        print(f"Hashed {migrated:,} plaintext passwords in {time.perf_counter() - start:.1f}s")
+    except mysql.connector.Error as e:
+        conn.rollback()
+        raise SystemExit(f"Migration failed (batches already committed are kept): {e}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,468 @@
+"""Item-to-item movie recommendations.
+
+Similarity between two movies blends two signals:
+
+* ratings: adjusted cosine over the sparse user x movie matrix from Review
+  (each user's ratings centred on their own mean), damped by
+  co_raters / (co_raters + shrink) so a pair rated by two people cannot top
+  a pair rated by two thousand;
+* content: cosine over TF-IDF weighted genre, director and actor overlap
+  from Movie_Genre / Movie_Director / Movie_Actor, which also covers movies
+  nobody has rated yet.
+
+Only the top-K neighbours of each movie are kept, in movie_neighbors.
+Similarities are computed a block of movies at a time, so memory stays at
+block_size x movies no matter how large the catalog is. Serving a user is
+then one bounded query (RECOMMEND_SQL): their latest liked movies, the stored
+neighbours of each, summed and ranked, under a MAX_EXECUTION_TIME budget.
+
+Training runs in its own process, outside the app:
+
+    python recommender.py train                  # full rebuild once
+    python recommender.py serve --interval 300   # keep retraining in the background
+    python recommender.py evaluate --k 10 --alphas 0.5,0.7,1.0
+
+``serve`` keeps the rating matrix in memory and, every interval, folds in
+only reviews newer than the last one it saw and recomputes the neighbour
+lists of the movies they touched; a full rebuild every --full-every seconds
+picks up edited and deleted reviews and catalog changes.
+"""
+import argparse
+import sys
+import time
+
+import mysql.connector
+import numpy as np
+from scipy import sparse
+
+import bulk_load
+
+DEFAULT_NEIGHBORS = 20
+DEFAULT_ALPHA = 0.7    # weight of the rating signal; the rest is content overlap
+DEFAULT_SHRINK = 25.0
+DEFAULT_BLOCK_SIZE = 256
+DEFAULT_CHUNK_SIZE = 50000
+LIKE_THRESHOLD = 3.5   # ratings at or above this count as "liked"
+RECOMMEND_SEEDS = 50   # latest liked movies a recommendation is built from
+
+# Relative weight of each kind of shared credit, before IDF
+FEATURE_WEIGHTS = {0: 1.0, 1: 2.0, 2: 1.0}  # genre, director, actor
+
+# Serving: at most RECOMMEND_SEEDS x DEFAULT_NEIGHBORS movie_neighbors rows per user
+SERVE_BUDGET_MS = 250
+RECOMMEND_SQL = f"""
+    SELECT /*+ MAX_EXECUTION_TIME({SERVE_BUDGET_MS}) */
+        m.movie_id,
+        m.name,
+        m.ratings,
+        m.total_reviews,
+        m.release_date,
+        m.genres,
+        m.poster_url,
+        rec.score,
+        rec.supporting
+    FROM (
+        SELECT n.neighbor_id, SUM(n.score * seed.rating) AS score, COUNT(*) AS supporting
+        FROM (
+            SELECT movie_id, rating
+            FROM Review
+            WHERE user_id = %s AND movie_id IS NOT NULL AND rating >= %s
+            ORDER BY date DESC
+            LIMIT %s
+        ) seed
+        JOIN movie_neighbors n ON n.movie_id = seed.movie_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Review r WHERE r.user_id = %s AND r.movie_id = n.neighbor_id
+        )
+        GROUP BY n.neighbor_id
+        ORDER BY score DESC
+        LIMIT %s
+    ) rec
+    JOIN movie_card m ON m.movie_id = rec.neighbor_id
+    ORDER BY rec.score DESC
+"""
+
+
+def recommendation_params(user_id, limit=10):
+    """Parameters for RECOMMEND_SQL"""
+    return (user_id, LIKE_THRESHOLD, RECOMMEND_SEEDS, user_id, limit)
+
+
+# Loading
+def load_ratings(conn, after_review_id=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Movie ratings newer than after_review_id as arrays: review_id, user_id, movie_id, rating10"""
+    chunks = []
+    cursor = conn.cursor(buffered=False)
+    try:
+        # Primary key range scan, streamed; ratings arrive as integers (rating x 10)
+        cursor.execute("""
+            SELECT review_id, user_id, movie_id, CAST(rating * 10 AS SIGNED)
+            FROM Review
+            WHERE review_id > %s AND movie_id IS NOT NULL AND rating IS NOT NULL
+            ORDER BY review_id
+        """, (after_review_id,))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            chunks.append(np.array(rows, dtype=np.int32).reshape(-1, 4))
+    finally:
+        cursor.close()
+    table = np.concatenate(chunks) if chunks else np.empty((0, 4), dtype=np.int32)
+    return {
+        "review_id": np.ascontiguousarray(table[:, 0]),
+        "user_id": np.ascontiguousarray(table[:, 1]),
+        "movie_id": np.ascontiguousarray(table[:, 2]),
+        "rating10": table[:, 3].astype(np.int8),
+    }
+
+
+def load_catalog(conn):
+    """(movie ids, TF-IDF weighted and L2-normalised movie x credit sparse matrix)"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT movie_id FROM Movie")
+        movie_ids = np.array([row[0] for row in cursor.fetchall()], dtype=np.int64)
+        cursor.execute("""
+            SELECT movie_id, 0, genre_id FROM Movie_Genre
+            UNION ALL
+            SELECT movie_id, 1, director_id FROM Movie_Director
+            UNION ALL
+            SELECT movie_id, 2, actor_id FROM Movie_Actor
+        """)
+        credits = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 3)
+    finally:
+        cursor.close()
+
+    n_movies = int(movie_ids.max(initial=0)) + 1
+    features, columns = np.unique(credits[:, 1] << 32 | credits[:, 2], return_inverse=True)
+    # Rare shared credits (a director, a lead actor) say more than common ones (Drama)
+    document_frequency = np.bincount(columns, minlength=len(features))
+    idf = np.log((len(movie_ids) + 1) / (document_frequency + 1)) + 1
+    kinds = features >> 32
+    weights = np.array([FEATURE_WEIGHTS[kind] for kind in range(len(FEATURE_WEIGHTS))])[kinds] * idf
+    content = sparse.csr_matrix(
+        (weights[columns], (credits[:, 0], columns)), shape=(n_movies, len(features)), dtype=np.float32
+    )
+    return movie_ids, _normalize_rows(content)
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    return sparse.diags(1 / np.where(norms > 0, norms, 1)).astype(np.float32) @ matrix
+
+
+def _concat(left, right):
+    return {name: np.concatenate([left[name], right[name]]) for name in left}
+
+
+# Model
+class ItemItemModel:
+    """Blended item-item similarity with top-K neighbour extraction in blocks"""
+
+    def __init__(self, k=DEFAULT_NEIGHBORS, alpha=DEFAULT_ALPHA, shrink=DEFAULT_SHRINK,
+                 block_size=DEFAULT_BLOCK_SIZE):
+        self.k = k
+        self.alpha = alpha
+        self.shrink = shrink
+        self.block_size = block_size
+        self.last_review_id = 0
+        # Movies whose neighbour lists went stale but have not been saved yet
+        self.pending = np.empty(0, dtype=np.int64)
+
+    def fit(self, ratings, movie_ids, content):
+        self._ratings = ratings
+        self.movie_ids = movie_ids
+        self._content = content
+        self.last_review_id = int(ratings["review_id"].max(initial=0))
+        self._build()
+        return self
+
+    def update(self, ratings, movie_ids, content):
+        """Fold in newer reviews and the current catalog; returns the movie ids now stale.
+
+        Stale means rated by one of the new reviews, or new to the catalog.
+        """
+        stale = np.union1d(np.unique(ratings["movie_id"]).astype(np.int64), np.setdiff1d(movie_ids, self.movie_ids))
+        self._ratings = _concat(self._ratings, ratings)
+        self.movie_ids = movie_ids
+        self._content = content
+        self.last_review_id = int(max(self.last_review_id, ratings["review_id"].max(initial=0)))
+        self._build()
+        self.pending = np.intersect1d(np.union1d(self.pending, stale), movie_ids)
+        return self.pending
+
+    def _build(self):
+        ratings = self._ratings
+        n_movies = int(max(ratings["movie_id"].max(initial=0), self.movie_ids.max(initial=0),
+                           self._content.shape[0] - 1)) + 1
+        # A review deleted and written again is still in memory twice; keep the newest per (user, movie)
+        newest_first = np.argsort(ratings["review_id"])[::-1]
+        pair = ratings["user_id"][newest_first].astype(np.int64) * n_movies + ratings["movie_id"][newest_first]
+        _, first = np.unique(pair, return_index=True)
+        keep = newest_first[first]
+        users = ratings["user_id"][keep]
+        movies = ratings["movie_id"][keep]
+        values = ratings["rating10"][keep] / 10.0
+
+        # Adjusted cosine: centre each user's ratings on their mean, then unit-normalise each movie column
+        n_users = int(users.max(initial=0)) + 1
+        counts = np.bincount(users, minlength=n_users)
+        means = np.bincount(users, weights=values, minlength=n_users) / np.maximum(counts, 1)
+        centred = sparse.csr_matrix((values - means[users], (users, movies)),
+                                    shape=(n_users, n_movies), dtype=np.float32)
+        self._ratings_by_movie = _normalize_rows(centred.T.tocsr())
+        self._raters_by_movie = sparse.csr_matrix((np.ones(len(users), dtype=np.float32), (movies, users)),
+                                                  shape=(n_movies, n_users))
+        content = self._content
+        if content.shape[0] < n_movies:
+            content = sparse.vstack([content, sparse.csr_matrix((n_movies - content.shape[0], content.shape[1]),
+                                                                dtype=np.float32)]).tocsr()
+        self._content_rows = content
+        self._candidates = np.zeros(n_movies, dtype=bool)
+        self._candidates[self.movie_ids] = True
+
+    def similarities(self, block):
+        """Dense len(block) x movies blended similarity, with self and non-catalog ids at -inf"""
+        rating_sim = (self._ratings_by_movie[block] @ self._ratings_by_movie.T).toarray()
+        co_raters = (self._raters_by_movie[block] @ self._raters_by_movie.T).toarray()
+        rating_sim *= co_raters / (co_raters + self.shrink)
+        content_sim = (self._content_rows[block] @ self._content_rows.T).toarray()
+        sim = self.alpha * rating_sim + (1 - self.alpha) * content_sim
+        sim[:, ~self._candidates] = -np.inf
+        sim[np.arange(len(block)), block] = -np.inf
+        return sim
+
+    def neighbors(self, movie_ids):
+        """Yield (movie_id, neighbour ids, scores) best first, for each of movie_ids"""
+        movie_ids = np.asarray(movie_ids, dtype=np.int64)
+        k = min(self.k, len(self._candidates) - 1)
+        for start in range(0, len(movie_ids), self.block_size):
+            block = movie_ids[start:start + self.block_size]
+            if k <= 0:
+                for movie_id in block:
+                    yield int(movie_id), np.empty(0, dtype=np.int64), np.empty(0)
+                continue
+            sim = self.similarities(block)
+            top = np.argpartition(sim, -k, axis=1)[:, -k:]
+            scores = np.take_along_axis(sim, top, axis=1)
+            order = np.argsort(-scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            scores = np.take_along_axis(scores, order, axis=1)
+            for row, movie_id in enumerate(block):
+                positive = scores[row] > 0
+                yield int(movie_id), top[row][positive], scores[row][positive]
+
+
+def save_neighbors(conn, model, movie_ids, report=None, batch_movies=500):
+    """Replace the movie_neighbors rows of movie_ids, committing once per batch of movies"""
+    cursor = conn.cursor()
+    saved = 0
+    try:
+        for batch in bulk_load.batched(model.neighbors(movie_ids), batch_movies):
+            ids = [movie_id for movie_id, _, _ in batch]
+            cursor.execute(f"DELETE FROM movie_neighbors WHERE movie_id IN ({', '.join(['%s'] * len(ids))})", ids)
+            rows = [(movie_id, rank_no, int(neighbor_id), float(score))
+                    for movie_id, neighbor_ids, scores in batch
+                    for rank_no, (neighbor_id, score) in enumerate(zip(neighbor_ids, scores), start=1)]
+            if rows:
+                cursor.executemany(
+                    "INSERT INTO movie_neighbors (movie_id, rank_no, neighbor_id, score) VALUES (%s, %s, %s, %s)",
+                    rows
+                )
+            conn.commit()
+            saved += len(ids)
+            if report:
+                report(saved)
+    finally:
+        cursor.close()
+    return saved
+
+
+# Offline evaluation
+def evaluate(ratings, movie_ids, content, k=10, holdout=0.2, seed=7, model_args=None, user_batch=200):
+    """Hide a random share of liked ratings, train on the rest, and score top-k recommendations.
+
+    Recommendations are scored like RECOMMEND_SQL (stored neighbour scores
+    summed over the user's liked movies, weighted by rating), except that
+    every liked movie is a seed rather than only the latest RECOMMEND_SEEDS.
+    Returns precision@k and recall@k for the model and for a most-rated
+    baseline, plus training time.
+    """
+    rng = np.random.default_rng(seed)
+    liked = ratings["rating10"] >= LIKE_THRESHOLD * 10
+    hidden = liked & (rng.random(len(liked)) < holdout)
+    train = {name: column[~hidden] for name, column in ratings.items()}
+
+    started = time.perf_counter()
+    model = ItemItemModel(**(model_args or {})).fit(train, movie_ids, content)
+    rows, cols, values = [], [], []
+    for movie_id, neighbor_ids, scores in model.neighbors(movie_ids):
+        rows.extend([movie_id] * len(neighbor_ids))
+        cols.extend(neighbor_ids)
+        values.extend(scores)
+    train_seconds = time.perf_counter() - started
+
+    n_movies = len(model._candidates)
+    n_users = int(ratings["user_id"].max(initial=0)) + 1
+    neighbor_matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n_movies, n_movies))
+    train_liked = train["rating10"] >= LIKE_THRESHOLD * 10
+
+    def user_matrix(mask, data, source):
+        return sparse.csr_matrix((data, (source["user_id"][mask], source["movie_id"][mask])),
+                                 shape=(n_users, n_movies))
+
+    seeds = user_matrix(train_liked, train["rating10"][train_liked] / 10.0, train)
+    seen = user_matrix(np.ones(len(train["user_id"]), dtype=bool), np.ones(len(train["user_id"])), train)
+    held_out = user_matrix(hidden, np.ones(int(hidden.sum())), ratings)
+    popularity = np.bincount(train["movie_id"], minlength=n_movies).astype(np.float32)
+    popularity[~model._candidates] = -np.inf
+
+    users = np.flatnonzero((np.diff(held_out.indptr) > 0) & (np.diff(seeds.indptr) > 0))
+    totals = {"model_hits": 0, "model_recommended": 0, "baseline_hits": 0, "model_recall": 0.0,
+              "baseline_recall": 0.0}
+    for start in range(0, len(users), user_batch):
+        batch = users[start:start + user_batch]
+        seen_rows, seen_cols = seen[batch].nonzero()
+        truth = held_out[batch].toarray() > 0
+        relevant = truth.sum(axis=1)
+        for name, scores in (("model", (seeds[batch] @ neighbor_matrix).toarray().astype(np.float32)),
+                             ("baseline", np.tile(popularity, (len(batch), 1)))):
+            scores[seen_rows, seen_cols] = -np.inf
+            top = np.argpartition(scores, -k, axis=1)[:, -k:]
+            found = np.take_along_axis(truth, top, axis=1) & (np.take_along_axis(scores, top, axis=1) > 0)
+            totals[f"{name}_hits"] += int(found.sum())
+            totals[f"{name}_recall"] += float((found.sum(axis=1) / relevant).sum())
+            if name == "model":
+                totals["model_recommended"] += int((np.take_along_axis(scores, top, axis=1) > 0).sum())
+
+    evaluated = max(len(users), 1)
+    return {
+        "users": len(users),
+        "hidden_ratings": int(hidden.sum()),
+        "train_seconds": train_seconds,
+        "precision": totals["model_hits"] / (evaluated * k),
+        "recall": totals["model_recall"] / evaluated,
+        "coverage": totals["model_recommended"] / (evaluated * k),
+        "baseline_precision": totals["baseline_hits"] / (evaluated * k),
+        "baseline_recall": totals["baseline_recall"] / evaluated,
+    }
+
+
+# Command line
+def parse_floats(text):
+    return [float(value) for value in text.split(",") if value.strip()]
+
+
+def model_arguments(args):
+    return {"k": args.neighbors, "alpha": args.alpha, "shrink": args.shrink, "block_size": args.block_size}
+
+
+def train_full(conn, args, log):
+    """Load everything, rebuild every movie's neighbours, and return the fitted model"""
+    started = time.perf_counter()
+    ratings = load_ratings(conn, chunk_size=args.chunk_size)
+    movie_ids, content = load_catalog(conn)
+    model = ItemItemModel(**model_arguments(args)).fit(ratings, movie_ids, content)
+    loaded = time.perf_counter() - started
+
+    def report(saved):
+        print(f"\rNeighbours: {saved:,}/{len(movie_ids):,} movies", end="", file=sys.stderr, flush=True)
+
+    save_neighbors(conn, model, movie_ids, report)
+    print(file=sys.stderr)
+    log(f"Full rebuild: {len(ratings['review_id']):,} ratings, {len(movie_ids):,} movies, "
+        f"loaded in {loaded:.1f}s, total {time.perf_counter() - started:.1f}s")
+    return model
+
+
+def train_incremental(conn, model, args, log):
+    """Fold in reviews newer than the model and refresh only the movies they touched"""
+    started = time.perf_counter()
+    ratings = load_ratings(conn, model.last_review_id, args.chunk_size)
+    movie_ids, content = load_catalog(conn)
+    touched = model.update(ratings, movie_ids, content)
+    save_neighbors(conn, model, touched)
+    # Only now are they fresh; a failed save leaves them pending for the next pass
+    model.pending = np.empty(0, dtype=np.int64)
+    log(f"Incremental: {len(ratings['review_id']):,} new ratings, {len(touched):,} movies refreshed "
+        f"in {time.perf_counter() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Item-to-item movie recommendations for SIDRAMA")
+    commands = parser.add_subparsers(dest="command", required=True)
+    train = commands.add_parser("train", help="rebuild every movie's neighbours once")
+    serve = commands.add_parser("serve", help="keep the neighbours fresh in the background")
+    serve.add_argument("--interval", type=float, default=300, help="seconds between incremental passes")
+    serve.add_argument("--full-every", type=float, default=86400, help="seconds between full rebuilds")
+    evaluation = commands.add_parser("evaluate", help="offline precision@K and training time")
+    evaluation.add_argument("--k", type=int, default=10, help="recommendations per user")
+    evaluation.add_argument("--holdout", type=float, default=0.2, help="share of liked ratings hidden")
+    evaluation.add_argument("--alphas", type=parse_floats, help="rating-signal weights to compare, comma separated")
+    evaluation.add_argument("--seed", type=int, default=7)
+
+    for command in (train, serve, evaluation):
+        command.add_argument("--neighbors", type=int, default=DEFAULT_NEIGHBORS, help="top-K kept per movie")
+        command.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="rating vs content weight")
+        command.add_argument("--shrink", type=float, default=DEFAULT_SHRINK, help="co-rater damping")
+        command.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE, help="movies per similarity block")
+        command.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="ratings per fetch")
+        bulk_load.add_connection_arguments(command)
+    args = parser.parse_args(argv)
+    settings = bulk_load.connection_settings(args)
+
+    def log(message):
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {message}", flush=True)
+
+    if args.command == "evaluate":
+        conn = mysql.connector.connect(**settings)
+        try:
+            ratings = load_ratings(conn, chunk_size=args.chunk_size)
+            movie_ids, content = load_catalog(conn)
+        except mysql.connector.Error as e:
+            raise SystemExit(f"Evaluation failed: {e}")
+        finally:
+            conn.close()
+        print(f"{'alpha':>5}  {'train s':>8}  {'P@' + str(args.k):>7}  {'R@' + str(args.k):>7}  "
+              f"{'coverage':>8}  {'popular P@' + str(args.k):>12}  {'users':>7}")
+        for alpha in args.alphas or [args.alpha]:
+            result = evaluate(ratings, movie_ids, content, args.k, args.holdout, args.seed,
+                              {**model_arguments(args), "alpha": alpha})
+            print(f"{alpha:>5.2f}  {result['train_seconds']:>8.1f}  {result['precision']:>7.4f}  "
+                  f"{result['recall']:>7.4f}  {result['coverage']:>8.1%}  {result['baseline_precision']:>12.4f}  "
+                  f"{result['users']:>7,}")
+        return
+
+    if args.command == "train":
+        conn = mysql.connector.connect(**settings, autocommit=False)
+        try:
+            train_full(conn, args, log)
+        except mysql.connector.Error as e:
+            conn.rollback()
+            raise SystemExit(f"Training failed (batches already committed are kept): {e}")
+        finally:
+            conn.close()
+        return
+
+    model = None
+    last_full = 0.0
+    while True:
+        try:
+            conn = mysql.connector.connect(**settings, autocommit=False)
+            try:
+                if model is None or time.monotonic() - last_full >= args.full_every:
+                    model = train_full(conn, args, log)
+                    last_full = time.monotonic()
+                else:
+                    train_incremental(conn, model, args, log)
+            finally:
+                conn.close()
+        except mysql.connector.Error as e:
+            # Keep the in-memory model; the next pass retries from the same watermark
+            log(f"Pass failed, retrying in {args.interval:.0f}s: {e}")
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
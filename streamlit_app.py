@@ -1,6 +1,29 @@
 import streamlit as st
 import mysql.connector
+from mysql.connector import pooling
+from contextlib import contextmanager
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
+import contextvars
+import difflib
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+import exports
+import recommender
+from analytics import AnalyticsEngine
+from data_access import ConcurrentLoader
+from image_cache import ImageCache
+from passwords import LoginBusy, PasswordHasher
 
 # Page configuration
 st.set_page_config(
@@ -44,21 +67,541 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Database connection function
-def get_db_connection():
-    """Create and return database connection"""
-    try:
-        connection = mysql.connector.connect(
-            host=st.secrets["mysql"]["host"],
-            user=st.secrets["mysql"]["user"],
-            password=st.secrets["mysql"]["password"],
-            database=st.secrets["mysql"]["database"],
-            port=st.secrets["mysql"]["port"]
+# Database connection pool
+class ConnectionPool:
+    """Process-wide pool of MySQL connections with health checks and timing metrics"""
+
+    def __init__(self, pool_size=5, checkout_timeout=5.0, **connect_args):
+        self.checkout_timeout = checkout_timeout
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name="sidrama_pool",
+            pool_size=pool_size,
+            pool_reset_session=True,
+            **connect_args
         )
-        return connection
+        self._lock = threading.Lock()
+        self._checked_out = {}
+        self.metrics = {
+            "checkouts": 0,
+            "returns": 0,
+            "timeouts": 0,
+            "reconnects": 0,
+            "checkout_wait_total": 0.0,
+            "checkout_wait_max": 0.0,
+            "hold_time_total": 0.0,
+            "hold_time_max": 0.0,
+        }
+
+    def checkout(self):
+        """Borrow a healthy connection, waiting up to checkout_timeout for a free slot"""
+        started = time.perf_counter()
+        deadline = started + self.checkout_timeout
+        while True:
+            try:
+                conn = self._pool.get_connection()
+                break
+            except pooling.PoolError:
+                if time.perf_counter() >= deadline:
+                    with self._lock:
+                        self.metrics["timeouts"] += 1
+                    raise
+                time.sleep(0.05)
+
+        # Health check: revive connections the server dropped while idle
+        try:
+            conn.ping(reconnect=False)
+        except mysql.connector.Error:
+            try:
+                conn.ping(reconnect=True, attempts=2, delay=0)
+            except mysql.connector.Error:
+                # Hand the slot back (close() re-queues even a dead connection)
+                # so a server outage does not shrink the pool for good
+                try:
+                    conn.close()
+                except mysql.connector.Error:
+                    pass
+                raise
+            with self._lock:
+                self.metrics["reconnects"] += 1
+
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.metrics["checkouts"] += 1
+            self.metrics["checkout_wait_total"] += waited
+            self.metrics["checkout_wait_max"] = max(self.metrics["checkout_wait_max"], waited)
+            self._checked_out[id(conn)] = time.perf_counter()
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool"""
+        with self._lock:
+            checked_out_at = self._checked_out.pop(id(conn), None)
+        try:
+            conn.close()
+        finally:
+            if checked_out_at is not None:
+                held = time.perf_counter() - checked_out_at
+                with self._lock:
+                    self.metrics["returns"] += 1
+                    self.metrics["hold_time_total"] += held
+                    self.metrics["hold_time_max"] = max(self.metrics["hold_time_max"], held)
+
+    def stats(self):
+        """Snapshot of pool metrics with derived averages"""
+        with self._lock:
+            snapshot = dict(self.metrics)
+            snapshot["in_use"] = len(self._checked_out)
+        snapshot["pool_size"] = self._pool.pool_size
+        snapshot["avg_checkout_wait"] = snapshot["checkout_wait_total"] / snapshot["checkouts"] if snapshot["checkouts"] else 0.0
+        snapshot["avg_hold_time"] = snapshot["hold_time_total"] / snapshot["returns"] if snapshot["returns"] else 0.0
+        return snapshot
+
+@st.cache_resource
+def get_connection_pool():
+    """Create the connection pool once per server process, shared by all sessions"""
+    config = st.secrets["mysql"]
+    return ConnectionPool(
+        pool_size=int(config.get("pool_size", 5)),
+        checkout_timeout=float(config.get("pool_timeout", 5.0)),
+        host=config["host"],
+        user=config["user"],
+        password=config["password"],
+        database=config["database"],
+        port=config["port"]
+    )
+
+# Query instrumentation
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+class QueryLog:
+    """Process-wide ring buffer of executed statements with timing, row counts and callers"""
+
+    def __init__(self, max_entries=2000):
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def statement_summary(self):
+        """Per-statement count, total and p50/p95/max wall time, slowest first"""
+        groups = defaultdict(list)
+        for entry in self.entries():
+            groups[entry["statement_id"]].append(entry)
+        summary = []
+        for entries in groups.values():
+            timings = sorted(entry["ms"] for entry in entries)
+            summary.append({
+                "statement": entries[-1]["sql"],
+                "calls": len(entries),
+                "total_ms": round(sum(timings), 1),
+                "p50_ms": round(_percentile(timings, 0.50), 1),
+                "p95_ms": round(_percentile(timings, 0.95), 1),
+                "max_ms": round(timings[-1], 1),
+                "avg_rows": round(sum(entry["rows"] for entry in entries) / len(entries), 1),
+                "function": entries[-1]["function"],
+            })
+        summary.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return summary
+
+    def page_summary(self):
+        """Per-page rerun count, queries per rerun and p50/p95 of per-rerun query time"""
+        reruns = defaultdict(lambda: {"page": None, "queries": 0, "ms": 0.0})
+        for entry in self.entries():
+            rerun = reruns[entry["rerun"]]
+            rerun["page"] = entry["page"]
+            rerun["queries"] += 1
+            rerun["ms"] += entry["ms"]
+        pages = defaultdict(list)
+        for rerun in reruns.values():
+            pages[rerun["page"]].append(rerun)
+        summary = []
+        for page, page_reruns in pages.items():
+            totals = sorted(rerun["ms"] for rerun in page_reruns)
+            summary.append({
+                "page": page,
+                "reruns": len(page_reruns),
+                "queries_per_rerun": round(sum(rerun["queries"] for rerun in page_reruns) / len(page_reruns), 1),
+                "p50_ms": round(_percentile(totals, 0.50), 1),
+                "p95_ms": round(_percentile(totals, 0.95), 1),
+            })
+        summary.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return summary
+
+    def rerun_totals(self, rerun_id):
+        """Query count and wall time recorded so far for one rerun"""
+        entries = [entry for entry in self.entries() if entry["rerun"] == rerun_id]
+        return {"queries": len(entries), "ms": round(sum(entry["ms"] for entry in entries), 1)}
+
+    def to_json(self):
+        return json.dumps(self.entries(), indent=2, default=str)
+
+@st.cache_resource
+def get_query_log():
+    """Create the query log once per server process, shared by all sessions"""
+    return QueryLog(max_entries=int(st.secrets.get("app", {}).get("query_log_size", 2000)))
+
+# Set by main() at the start of every rerun; read by the instrumented cursor
+current_rerun = contextvars.ContextVar("current_rerun", default={"id": None, "page": None})
+
+# Frames that belong to the database plumbing rather than to the code issuing a query
+_PLUMBING_FUNCTIONS = {"execute", "executemany", "callproc", "_record", "load", "get_or_load",
+                       "cached_query", "query_rows", "run", "__enter__", "__exit__", "_calling_functions"}
+
+def _calling_functions():
+    """(page function, nearest caller) for the statement being executed.
+
+    On page-loader threads the page function is not on the stack; it comes
+    from the rerun context set by load_page_data() instead.
+    """
+    frame = sys._getframe(2)
+    caller = None
+    while frame is not None:
+        name = frame.f_code.co_name
+        if name.startswith("show_") and name.endswith("_page"):
+            return name, caller or name
+        if caller is None and frame.f_code.co_filename == __file__ and name not in _PLUMBING_FUNCTIONS:
+            caller = name
+        frame = frame.f_back
+    page_function = current_rerun.get().get("function")
+    return page_function or caller or "?", caller or page_function or "?"
+
+def _normalize_sql(sql):
+    """Collapse whitespace and IN (%s, %s, ...) lists so batched variants group together"""
+    sql = " ".join(str(sql).split())
+    return re.sub(r"%s(?:\s*,\s*%s)+", "%s, ...", sql)
+
+class InstrumentedCursor:
+    """Cursor proxy that times every statement and records it in the QueryLog.
+
+    Parameter values are never stored, only a short fingerprint, so passwords and
+    other user input do not end up in the log.
+    """
+
+    def __init__(self, cursor, log):
+        self._cursor = cursor
+        self._log = log
+        self._last = None
+
+    def _record(self, sql, params, started, rows):
+        page_function, caller = _calling_functions()
+        rerun = current_rerun.get()
+        normalized = _normalize_sql(sql)
+        self._last = {
+            "at": datetime.now().isoformat(timespec="milliseconds"),
+            "rerun": rerun["id"],
+            "page": rerun["page"],
+            "function": page_function,
+            "caller": caller,
+            "sql": normalized,
+            "statement_id": hashlib.sha1(normalized.encode()).hexdigest()[:12],
+            "params_fingerprint": hashlib.sha1(repr(params).encode()).hexdigest()[:12] if params else None,
+            "rows": max(rows, 0),
+            "ms": (time.perf_counter() - started) * 1000,
+        }
+        self._log.record(self._last)
+
+    def _add_fetch(self, started, rows):
+        if self._last is not None:
+            self._last["rows"] += rows
+            self._last["ms"] += (time.perf_counter() - started) * 1000
+
+    def execute(self, sql, params=(), *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, params, *args, **kwargs)
+        finally:
+            # SELECT rows are counted as they are fetched
+            self._record(sql, params, started, 0 if self._cursor.with_rows else self._cursor.rowcount)
+
+    def executemany(self, sql, seq_params, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, seq_params, *args, **kwargs)
+        finally:
+            self._record(sql, seq_params, started, self._cursor.rowcount)
+
+    def callproc(self, procname, args=()):
+        started = time.perf_counter()
+        try:
+            return self._cursor.callproc(procname, args)
+        finally:
+            rows = sum(max(result.rowcount, 0) for result in self._cursor.stored_results())
+            self._record(f"CALL {procname}({', '.join(['%s'] * len(args))})", args, started, rows)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._add_fetch(started, row is not None)
+        return row
+
+    def fetchmany(self, size=1):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self._add_fetch(started, len(rows))
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._add_fetch(started, len(rows))
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors are instrumented"""
+
+    def __init__(self, conn, log):
+        self._conn = conn
+        self._log = log
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs), self._log)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection and always hand it back; yields None if unavailable"""
+    try:
+        pool = get_connection_pool()
+        conn = pool.checkout()
     except Exception as e:
         st.error(f"Database connection error: {e}")
+        yield None
+        return
+    try:
+        yield InstrumentedConnection(conn, get_query_log())
+    finally:
+        pool.release(conn)
+
+@contextmanager
+def db_cursor(dictionary=False):
+    """Borrow a pooled connection and a cursor, closing both on every path"""
+    with db_connection() as conn:
+        if conn is None:
+            yield None
+            return
+        cursor = conn.cursor(dictionary=dictionary)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+# Shared query result cache
+class QueryCache:
+    """Process-wide LRU cache of read query results with per-entry TTL and tag invalidation"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, tags, value)
+        self._generations = {}  # tag -> number of invalidate() calls so far
+        self._lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0, "stale_loads": 0}
+
+    def get_or_load(self, key, loader, ttl, tags=()):
+        """Return the cached value for key, calling loader() on a miss or after expiry.
+
+        A loader result of None (e.g. database unavailable) is returned but not cached,
+        and neither is one whose tags were invalidated while loader() ran: it may
+        predate the write that caused the invalidation.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.metrics["hits"] += 1
+                return entry[2]
+            self.metrics["misses"] += 1
+            generations = [self._generations.get(tag, 0) for tag in tags]
+
+        value = loader()
+        if value is None:
+            return None
+
+        with self._lock:
+            if generations != [self._generations.get(tag, 0) for tag in tags]:
+                self.metrics["stale_loads"] += 1
+                return value
+            self._entries[key] = (time.monotonic() + ttl, frozenset(tags), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics["evictions"] += 1
+        return value
+
+    def invalidate(self, tag):
+        """Drop every entry carrying tag, and any load of it still in flight"""
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, (_, tags, _) in self._entries.items() if tag in tags]
+            for key in stale:
+                del self._entries[key]
+            self.metrics["invalidations"] += len(stale)
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            snapshot = dict(self.metrics)
+            snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
+
+@st.cache_resource
+def get_query_cache():
+    """Create the query cache once per server process, shared by all sessions"""
+    return QueryCache(max_entries=256)
+
+def cached_query(sql, params=(), ttl=300, tags=(), dictionary=True):
+    """Run a read query through the shared cache; returns None if the database is unavailable.
+
+    Callers must treat the returned rows as read-only since they are shared.
+    """
+    def load():
+        with db_cursor(dictionary=dictionary) as cursor:
+            if cursor:
+                cursor.execute(sql, params)
+                return cursor.fetchall()
         return None
+    return get_query_cache().get_or_load((sql, tuple(params), dictionary), load, ttl, tags)
+
+def query_rows(sql, params=(), dictionary=True):
+    """Run an uncached read query on its own pooled connection; None if the database is unavailable"""
+    with db_cursor(dictionary=dictionary) as cursor:
+        if cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+    return None
+
+@st.cache_resource
+def get_recommendation_cache():
+    """Per-user recommendation rows, kept out of the shared query cache so they
+    neither evict catalog entries nor drop with every user's review writes"""
+    return QueryCache(max_entries=1024)
+
+def load_recommendations(user_id, limit=6):
+    """The user's "Recommended for You" rows; dropped by their own movie review writes"""
+    def load():
+        return query_rows(recommender.RECOMMEND_SQL, recommender.recommendation_params(user_id, limit))
+    return get_recommendation_cache().get_or_load((user_id, limit), load, RATINGS_TTL, (f"user:{user_id}",))
+
+# Concurrent page loading
+@st.cache_resource
+def get_page_loader():
+    """Create the page-loader thread pool once per server process ([app] loader_workers is optional)"""
+    return ConcurrentLoader(max_workers=int(st.secrets.get("app", {}).get("loader_workers", 4)))
+
+def load_page_data(**tasks):
+    """Run a page's independent queries concurrently and return them as one ResultBundle.
+
+    Each task is a callable or (callable, *args) that opens its own pooled
+    connection, e.g. (cached_query, sql, params). Worker threads get this
+    rerun's Streamlit context, so st.error from the plumbing still renders,
+    and the query log attributes their statements to the calling page.
+    """
+    page_function, _ = _calling_functions()
+    ctx = get_script_run_ctx()
+
+    def attach_context(fn):
+        def run(*args):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return fn(*args)
+        return run
+
+    token = current_rerun.set({**current_rerun.get(), "function": page_function})
+    try:
+        return get_page_loader().run(tasks, wrap=attach_context)
+    finally:
+        current_rerun.reset(token)
+
+# In-memory analytics snapshot
+@st.cache_resource
+def get_analytics_engine():
+    """Create the analytics engine once per server process ([analytics] secrets are optional)"""
+    config = st.secrets.get("analytics", {})
+    pool = get_connection_pool()
+    query_log = get_query_log()
+
+    @contextmanager
+    def connect():
+        # Refreshes run on a background thread, so they borrow from the pool directly
+        conn = pool.checkout()
+        try:
+            yield InstrumentedConnection(conn, query_log)
+        finally:
+            pool.release(conn)
+
+    return AnalyticsEngine(connect, max_age=float(config.get("max_age", 600)),
+                           chunk_size=int(config.get("chunk_size", 50000)))
+
+def format_age(seconds):
+    """Short human age such as '45s', '12 min' or '3.5 h'"""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+# Cache tags: "ratings" entries are dropped whenever a review is written
+CATALOG_TTL = 3600
+RATINGS_TTL = 300
+# title_leaderboard is rewritten by a scheduled refresh, not by review writes; reads
+# that also show live Movie / tvshow ratings are still tagged "ratings"
+LEADERBOARD_TTL = 60
+
+# Local poster/profile image cache
+@st.cache_resource
+def get_image_cache():
+    """Create the on-disk image cache once per server process ([images] secrets are optional)"""
+    config = st.secrets.get("images", {})
+    default_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".image_cache")
+    return ImageCache(
+        config.get("cache_dir", default_dir),
+        thumb_size=(int(config.get("thumb_width", 200)), int(config.get("thumb_height", 300))),
+        timeout=float(config.get("timeout", 5.0))
+    )
+
+def poster_image(url, thumbnail=True):
+    """Local path for a poster or profile image: a cached thumbnail, the original, or the placeholder"""
+    cache = get_image_cache()
+    return cache.thumbnail(url) if thumbnail else cache.original(url)
+
+def prefetch_images(urls):
+    """Download and thumbnail a page of images concurrently before rendering it"""
+    get_image_cache().prefetch(urls)
+
+# Password hashing
+@st.cache_resource
+def get_password_hasher():
+    """Create the scrypt verification pool once per server process ([auth] secrets are optional)"""
+    config = st.secrets.get("auth", {})
+    return PasswordHasher(
+        cost=int(config.get("scrypt_cost", 14)),
+        max_workers=int(config.get("hash_workers", 2)),
+        max_pending=int(config.get("max_pending_logins", 16)),
+        timeout=float(config.get("hash_timeout", 10.0))
+    )
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
@@ -69,51 +612,576 @@ if 'username' not in st.session_state:
     st.session_state.username = None
 if 'page' not in st.session_state:
     st.session_state.page = "Home"
+if 'session_key' not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex[:8]
+    st.session_state.rerun_seq = 0
 
 # Authentication functions
 def login_user(username, password):
-    """Authenticate user"""
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT user_id, username, name FROM User WHERE username = %s AND password = %s", 
-                      (username, password))
+    """Authenticate user.
+
+    Looks the row up by the unique username index and verifies the password
+    on the hashing pool. Plaintext or outdated hashes are upgraded on success.
+    Raises LoginBusy when the pool is saturated or the check times out.
+    """
+    user = None
+    with db_cursor(dictionary=True) as cursor:
+        if not cursor:
+            return None
+        cursor.execute("SELECT user_id, username, name, password FROM User WHERE username = %s", (username,))
         user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return user
-    return None
+    
+    hasher = get_password_hasher()
+    stored = user.pop('password') if user else None
+    matches, needs_rehash = hasher.verify(password, stored)
+    if not matches:
+        return None
+    
+    if needs_rehash:
+        try:
+            new_hash = hasher.hash(password)
+        except LoginBusy:
+            # The password already checked out; upgrade it on a later sign-in
+            return user
+        with db_connection() as conn:
+            if conn:
+                cursor = conn.cursor()
+                try:
+                    # Compare-and-set: a concurrent password change wins
+                    cursor.execute("UPDATE User SET password = %s WHERE user_id = %s AND password = %s",
+                                   (new_hash, user['user_id'], stored))
+                    conn.commit()
+                except mysql.connector.Error:
+                    conn.rollback()
+                finally:
+                    cursor.close()
+    return user
 
 def register_user(username, password, name, dob, email, ph_no, address):
-    """Register new user"""
-    conn = get_db_connection()
-    if conn:
-        try:
+    """Register new user (raises LoginBusy when the hashing pool is saturated)"""
+    password = get_password_hasher().hash(password)
+    with db_connection() as conn:
+        if conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO User (username, password, name, dob, email, ph_no, address) 
-                   VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (username, password, name, dob, email, ph_no, address)
-            )
-            conn.commit()
-            user_id = cursor.lastrowid
-            cursor.close()
-            conn.close()
-            return user_id
-        except mysql.connector.Error as e:
-            st.error(f"Registration error: {e}")
-            return None
+            try:
+                cursor.execute(
+                    """INSERT INTO User (username, password, name, dob, email, ph_no, address) 
+                       VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                    (username, password, name, dob, email, ph_no, address)
+                )
+                conn.commit()
+                return cursor.lastrowid
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"Registration error: {e}")
+                return None
+            finally:
+                cursor.close()
     return None
 
+# Batched detail loaders
+def _in_placeholders(values):
+    """Build a '%s, %s, ...' list for an IN clause"""
+    return ", ".join(["%s"] * len(values))
+
+def load_movie_detail(movie_id, review_limit=5):
+    """Detail fields and latest reviews of one movie, fetched only when its card is opened.
+
+    Returns (detail row or None, [review rows]) through the shared cache; review
+    lists are dropped on review and like writes.
+    """
+    detail = cached_query("""
+        SELECT movie_id, poster_url, descr, total_duration, box_office, age_rating, language,
+               directors, actors
+        FROM movie_card
+        WHERE movie_id = %s
+    """, (movie_id,), ttl=CATALOG_TTL, tags=("catalog",))
+    reviews = cached_query("""
+        SELECT review_id, username, user_name, rating, review_text, review_date, likes_count
+        FROM movie_reviews_view
+        WHERE movie_id = %s
+        ORDER BY review_date DESC, review_id DESC
+        LIMIT %s
+    """, (movie_id, review_limit), ttl=RATINGS_TTL, tags=("ratings", "reviews"))
+    return (detail[0] if detail else None), reviews or []
+
+def load_show_detail(show_id, review_limit=3):
+    """Detail fields and latest episode reviews of one show, fetched only when its card is opened"""
+    detail = cached_query("""
+        SELECT show_id, poster_url, descr, num_of_episodes, age_rating, language, status
+        FROM show_card
+        WHERE show_id = %s
+    """, (show_id,), ttl=CATALOG_TTL, tags=("catalog",))
+    reviews = cached_query("""
+        SELECT review_id, username, episode_title, season_number, episode_no,
+               rating, review_text, review_date, likes_count
+        FROM episode_reviews_view
+        WHERE show_id = %s
+        ORDER BY review_date DESC, review_id DESC
+        LIMIT %s
+    """, (show_id, review_limit), ttl=RATINGS_TTL, tags=("ratings", "reviews"))
+    return (detail[0] if detail else None), reviews or []
+
+def load_like_state(cursor, user_id, review_ids):
+    """The user's like state for review_ids: {review_id: (liked, pending)}.
+
+    Likes not yet folded in by apply_like_events() are read from the queue and
+    override Review_Likes, marked pending; reviews the user never liked are
+    left out.
+    """
+    review_ids = list(review_ids)
+    if not review_ids:
+        return {}
+    placeholders = _in_placeholders(review_ids)
+    cursor.execute(f"""
+        SELECT review_id FROM Review_Likes
+        WHERE user_id = %s AND review_id IN ({placeholders})
+    """, [user_id] + review_ids)
+    state = {(row['review_id'] if isinstance(row, dict) else row[0]): (True, False) for row in cursor.fetchall()}
+    cursor.execute(f"""
+        SELECT review_id, liked FROM Review_Like_Events
+        WHERE user_id = %s AND review_id IN ({placeholders})
+        ORDER BY event_id
+    """, [user_id] + review_ids)
+    for row in cursor.fetchall():
+        review_id, liked = (row['review_id'], row['liked']) if isinstance(row, dict) else row
+        state[review_id] = (bool(liked), True)
+    return state
+
+def load_card_likes(reviews):
+    """Like state of an opened card's reviews, on a connection of its own"""
+    with db_cursor() as cursor:
+        if cursor:
+            return load_like_state(cursor, st.session_state.user_id,
+                                   [review['review_id'] for review in reviews])
+    return {}
+
+# Keyset pagination
+PAGE_SIZE = 20
+
+def get_page_cursor(state_key, signature=None):
+    """Keyset cursor of the current page; the listing restarts when its filters (signature) change"""
+    pager = st.session_state.get(state_key)
+    if pager is None or pager['signature'] != signature:
+        pager = {'signature': signature, 'cursors': [None]}
+        st.session_state[state_key] = pager
+    return pager['cursors'][-1]
+
+def rating_keyset_predicate(alias, id_column, page_cursor):
+    """Seek past page_cursor in (ratings DESC, release_date DESC, id DESC) order.
+
+    release_date is nullable and DESC order puts NULL dates last within a
+    rating, where the row comparison alone evaluates to NULL; that tail is
+    spelled out so NULL-dated titles stay reachable. Returns (sql, params).
+    """
+    ratings, release_date, title_id = page_cursor
+    if release_date is None:
+        return (f"({alias}.ratings < %s OR ({alias}.ratings = %s AND {alias}.release_date IS NULL "
+                f"AND {alias}.{id_column} < %s))", [ratings, ratings, title_id])
+    return (f"(({alias}.ratings, {alias}.release_date, {alias}.{id_column}) < (%s, %s, %s) "
+            f"OR ({alias}.ratings = %s AND {alias}.release_date IS NULL))",
+            [ratings, release_date, title_id, ratings])
+
+def page_controls(state_key, rows, key_fn, page_size=PAGE_SIZE):
+    """Drop the look-ahead row, render Previous/Next and return the rows of this page.
+
+    Queries fetch page_size + 1 rows after the cursor; the extra row only
+    signals that a next page exists. Previous pops back to the cursor the
+    earlier page was fetched with, so every page is a single index seek.
+    """
+    pager = st.session_state[state_key]
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← Previous", key=f"{state_key}_prev", disabled=len(pager['cursors']) == 1):
+            pager['cursors'].pop()
+            st.rerun()
+    with col_page:
+        st.caption(f"Page {len(pager['cursors'])}")
+    with col_next:
+        if st.button("Next →", key=f"{state_key}_next", disabled=not has_next):
+            pager['cursors'].append(key_fn(rows[-1]))
+            st.rerun()
+    return rows
+
+# Full-text search
+FULLTEXT_MIN_TOKEN = 3  # InnoDB innodb_ft_min_token_size default
+
+def to_boolean_query(term):
+    """Turn free text into a FULLTEXT boolean query requiring every word as a prefix.
+
+    Mirrors the to_boolean_prefix_query() SQL function; returns '' when no
+    word is long enough to be indexed.
+    """
+    tokens = [t for t in re.findall(r"\w+", term.lower()) if len(t) >= FULLTEXT_MIN_TOKEN]
+    return " ".join(f"+{t}*" for t in tokens)
+
+@st.cache_data(ttl=600)
+def load_search_vocabulary():
+    """Distinct name tokens across the catalog, bucketed by (first letter, length) for typo lookup"""
+    buckets = defaultdict(set)
+    with db_cursor() as cursor:
+        if cursor:
+            cursor.execute("""
+                SELECT name FROM Movie
+                UNION SELECT name FROM tvshow
+                UNION SELECT name FROM Actor
+                UNION SELECT name FROM Director
+            """)
+            for (name,) in cursor.fetchall():
+                for token in re.findall(r"\w+", name.lower()):
+                    if len(token) >= FULLTEXT_MIN_TOKEN:
+                        buckets[(token[0], len(token))].add(token)
+    return {key: sorted(tokens) for key, tokens in buckets.items()}
+
+def suggest_query(term, vocabulary):
+    """Correct each misspelt word against the catalog vocabulary; None if nothing changed.
+
+    Only buckets sharing the first letter and within two characters of the
+    word's length are compared, so lookup cost does not grow with the catalog.
+    """
+    corrected = []
+    changed = False
+    for token in re.findall(r"\w+", term.lower()):
+        candidates = []
+        for length in range(len(token) - 2, len(token) + 3):
+            candidates.extend(vocabulary.get((token[0], length), []))
+        if token in candidates or len(token) < FULLTEXT_MIN_TOKEN:
+            corrected.append(token)
+            continue
+        match = difflib.get_close_matches(token, candidates, n=1, cutoff=0.75)
+        if match:
+            corrected.append(match[0])
+            changed = True
+        else:
+            corrected.append(token)
+    return " ".join(corrected) if changed else None
+
+def search_catalog(cursor, term, limit=20):
+    """Relevance-ranked search across movies, shows, actors and directors"""
+    cursor.callproc('search_catalog', [term, limit])
+    results = []
+    for result in cursor.stored_results():
+        results = result.fetchall()
+    return results
+
+# Review likes
+def set_review_like(review_id, liked):
+    """Queue a like or unlike of a review.
+
+    The click only appends to Review_Like_Events, so a viral review's likes
+    never wait on its row lock; the apply_like_events_batch event folds them
+    into Review_Likes and likes_count every few seconds. Only the last queued
+    action per user and review counts, so repeated clicks are idempotent.
+    """
+    with db_connection() as conn:
+        if conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "INSERT INTO Review_Like_Events (review_id, user_id, liked) VALUES (%s, %s, %s)",
+                    (review_id, st.session_state.user_id, liked)
+                )
+                conn.commit()
+                return True
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"❌ Error updating like: {e}")
+                return False
+            finally:
+                cursor.close()
+    return False
+
+def like_button(review, like_state, key_prefix):
+    """Render a like/unlike toggle for a review row; a queued toggle shows as pending"""
+    liked, pending = like_state.get(review['review_id'], (False, False))
+    label = f"{'💔 Unlike' if liked else '👍 Like'} ({review['likes_count']}{' ⏳' if pending else ''})"
+    if st.button(label, key=f"{key_prefix}_{review['review_id']}",
+                 help="Counted within a few seconds" if pending else None):
+        if set_review_like(review['review_id'], not liked):
+            st.rerun()
+
+# Watchlist and custom lists
+WATCHLIST_COLUMNS = {'movie': 'movie_id', 'show': 'show_id'}
+
+def load_watchlist_status(cursor, kind, title_ids):
+    """Watchlist state for a page of titles: {title_id: None if not listed, else watched}.
+
+    Titles not seen earlier in the session are resolved in one query and kept
+    in session state; watchlist writes update that cache in place.
+    """
+    known = st.session_state.setdefault('watchlist_status', {'movie': {}, 'show': {}})[kind]
+    missing = [title_id for title_id in title_ids if title_id not in known]
+    if missing:
+        column = WATCHLIST_COLUMNS[kind]
+        cursor.execute(f"""
+            SELECT {column}, watched FROM Watchlist
+            WHERE user_id = %s AND {column} IN ({_in_placeholders(missing)})
+        """, [st.session_state.user_id] + missing)
+        found = {}
+        for row in cursor.fetchall():
+            title_id, watched = (row[column], row['watched']) if isinstance(row, dict) else row
+            found[title_id] = bool(watched)
+        for title_id in missing:
+            known[title_id] = found.get(title_id)
+    return {title_id: known[title_id] for title_id in title_ids}
+
+def set_watchlist(kind, title_id, listed):
+    """Add a title to or remove it from the watchlist (also used as a button callback)"""
+    column = WATCHLIST_COLUMNS[kind]
+    with db_connection() as conn:
+        if conn:
+            cursor = conn.cursor()
+            try:
+                if listed:
+                    cursor.execute(f"INSERT IGNORE INTO Watchlist (user_id, {column}) VALUES (%s, %s)",
+                                   (st.session_state.user_id, title_id))
+                else:
+                    cursor.execute(f"DELETE FROM Watchlist WHERE user_id = %s AND {column} = %s",
+                                   (st.session_state.user_id, title_id))
+                conn.commit()
+                # Keep whatever watched flag an existing row had; forget it so the next page re-reads it
+                known = st.session_state.setdefault('watchlist_status', {'movie': {}, 'show': {}})[kind]
+                if listed and cursor.rowcount == 0:
+                    known.pop(title_id, None)
+                else:
+                    known[title_id] = False if listed else None
+                return True
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"❌ Error updating watchlist: {e}")
+                return False
+            finally:
+                cursor.close()
+    return False
+
+def set_watched(kind, title_id, watched):
+    """Mark a watchlist title as watched or unwatched"""
+    column = WATCHLIST_COLUMNS[kind]
+    with db_connection() as conn:
+        if conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"UPDATE Watchlist SET watched = %s WHERE user_id = %s AND {column} = %s",
+                               (watched, st.session_state.user_id, title_id))
+                conn.commit()
+                known = st.session_state.setdefault('watchlist_status', {'movie': {}, 'show': {}})[kind]
+                known[title_id] = watched
+                return True
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"❌ Error updating watchlist: {e}")
+                return False
+            finally:
+                cursor.close()
+    return False
+
+def load_user_lists():
+    """The user's custom lists as [(list_id, list_name)], read once and kept in session state"""
+    if st.session_state.get('user_lists') is None:
+        with db_cursor() as cursor:
+            if cursor:
+                cursor.execute("SELECT list_id, list_name FROM User_List WHERE user_id = %s ORDER BY list_name",
+                               (st.session_state.user_id,))
+                st.session_state.user_lists = cursor.fetchall()
+    return st.session_state.get('user_lists') or []
+
+def add_to_list(list_id, kind, title_id):
+    """Add a title to one of the user's lists; returns False if it was already there"""
+    column = WATCHLIST_COLUMNS[kind]
+    with db_connection() as conn:
+        if conn:
+            cursor = conn.cursor()
+            try:
+                # Selecting the list through User_List keeps users to their own lists
+                cursor.execute(f"""
+                    INSERT IGNORE INTO List_Items (list_id, {column})
+                    SELECT list_id, %s FROM User_List WHERE list_id = %s AND user_id = %s
+                """, (title_id, list_id, st.session_state.user_id))
+                conn.commit()
+                return cursor.rowcount > 0
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"❌ Error updating list: {e}")
+                return False
+            finally:
+                cursor.close()
+    return False
+
+def move_list_items(item_ids, from_list_id, to_list_id=None):
+    """Move (or, without a target, remove) several list items in one transaction.
+
+    Titles already in the target list are not duplicated; either every item
+    moves or, on error, none does.
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return False
+    placeholders = _in_placeholders(item_ids)
+    with db_connection() as conn:
+        if conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("""
+                    SELECT list_id FROM User_List WHERE user_id = %s AND list_id IN (%s, %s) FOR UPDATE
+                """, (st.session_state.user_id, from_list_id, to_list_id or from_list_id))
+                owned = {row[0] for row in cursor.fetchall()}
+                if from_list_id not in owned or (to_list_id is not None and to_list_id not in owned):
+                    conn.rollback()
+                    st.error("❌ You can only move items between your own lists.")
+                    return False
+                if to_list_id is not None:
+                    cursor.execute(f"""
+                        INSERT IGNORE INTO List_Items (list_id, movie_id, show_id)
+                        SELECT %s, movie_id, show_id FROM List_Items
+                        WHERE list_id = %s AND list_item_id IN ({placeholders})
+                    """, [to_list_id, from_list_id] + item_ids)
+                cursor.execute(f"""
+                    DELETE FROM List_Items WHERE list_id = %s AND list_item_id IN ({placeholders})
+                """, [from_list_id] + item_ids)
+                conn.commit()
+                return True
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"❌ Error moving list items: {e}")
+                return False
+            finally:
+                cursor.close()
+    return False
+
+def list_picker(kind, title_id):
+    """Add-to-list control for an opened card"""
+    lists = load_user_lists()
+    if not lists:
+        st.caption("Create a list on the 📋 My Lists page to collect titles.")
+        return
+    col_list, col_add = st.columns([3, 1])
+    with col_list:
+        list_id = st.selectbox("Add to list", [list_id for list_id, _ in lists],
+                               format_func=dict(lists).get, key=f"list_pick_{kind}_{title_id}",
+                               label_visibility="collapsed")
+    with col_add:
+        if st.button("➕ Add", key=f"list_add_{kind}_{title_id}", use_container_width=True):
+            if add_to_list(list_id, kind, title_id):
+                st.success(f"Added to {dict(lists)[list_id]}")
+            else:
+                st.info("Already in that list.")
+
+# Lazily opened list cards
+def toggle_open_title(state_key, title_id):
+    """Button callback: open title_id's card (closing any other), or close it if already open"""
+    st.session_state[state_key] = None if st.session_state.get(state_key) == title_id else title_id
+
+def card_header(state_key, title_id, title, watchlist=None):
+    """Render a collapsed card row; returns True when this title is the open one.
+
+    The toggle runs as an on_click callback, so the open title is already in
+    session state when the rerun renders the page and no extra rerun is needed.
+    Pass watchlist=(kind, status) to add a watchlist toggle to the row.
+    """
+    is_open = st.session_state.get(state_key) == title_id
+    if watchlist:
+        col_title, col_watch, col_toggle = st.columns([4, 1, 1])
+        kind, status = watchlist
+        with col_watch:
+            st.button("★ Listed" if status is not None else "☆ Watchlist", key=f"watch_{kind}_{title_id}",
+                      on_click=set_watchlist, args=(kind, title_id, status is None), use_container_width=True)
+    else:
+        col_title, col_toggle = st.columns([5, 1])
+    with col_title:
+        st.markdown(title)
+    with col_toggle:
+        st.button("▾ Hide" if is_open else "▸ Details", key=f"{state_key}_{title_id}",
+                  on_click=toggle_open_title, args=(state_key, title_id), use_container_width=True)
+    return is_open
+
+# Data export
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "sidrama_exports")
+# A browser download is held in Streamlit's media store, so the page only offers
+# exports up to this size; the exports.py command line streams any size to disk
+EXPORT_UI_MAX_ROWS = 250000
+EXPORT_UI_MAX_BYTES = 50 * 1024 * 1024
+EXPORT_CLI_HINT = "Run `python exports.py --help` on the server to export it to a file instead."
+
+def find_titles(kind, term, limit=20):
+    """(id, name) pairs of movies or shows matching term, most reviewed first"""
+    if kind == "Movie":
+        boolean_query = to_boolean_query(term)
+        if boolean_query:
+            sql = ("SELECT movie_id, name FROM movie_card WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE) "
+                   "ORDER BY total_reviews DESC LIMIT %s")
+            return cached_query(sql, (boolean_query, limit), ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+        sql = "SELECT movie_id, name FROM movie_card WHERE name LIKE %s ORDER BY total_reviews DESC LIMIT %s"
+    else:
+        sql = "SELECT show_id, name FROM show_card WHERE name LIKE %s ORDER BY total_reviews DESC LIMIT %s"
+    return cached_query(sql, (f"{term}%", limit), ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+
+def run_export(query, fmt):
+    """Stream query into a temporary file behind a progress bar.
+
+    Returns the file's contents and the stream_export result, or None when the
+    export failed or is over the EXPORT_UI_MAX_* limits.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(prefix=f"{query.name}_", suffix=f".{fmt}", dir=EXPORT_DIR)
+    os.close(fd)
+    progress_bar = st.progress(0.0, text="Starting export...")
+
+    def report(written, total):
+        of_total = f" of ~{total:,}" if total else ""
+        progress_bar.progress(min(written / total, 1.0) if total else 0.0,
+                              text=f"Exported {written:,}{of_total} rows")
+
+    try:
+        with db_connection() as conn:
+            if conn is None:
+                return None
+            try:
+                total = exports.expected_rows(conn, query)
+                if total is not None and total > EXPORT_UI_MAX_ROWS:
+                    progress_bar.empty()
+                    st.warning(f"This export has about {total:,} rows, more than the {EXPORT_UI_MAX_ROWS:,} "
+                               f"a browser download allows. {EXPORT_CLI_HINT}")
+                    return None
+                result = exports.stream_export(conn, query, path, fmt, progress=report)
+            except (mysql.connector.Error, ValueError, OSError) as e:
+                progress_bar.empty()
+                st.error(f"Export failed: {e}")
+                return None
+        if result['bytes'] > EXPORT_UI_MAX_BYTES:
+            progress_bar.empty()
+            st.warning(f"The export came to {result['bytes'] / 1e6:,.0f} MB, more than the "
+                       f"{EXPORT_UI_MAX_BYTES / 1e6:,.0f} MB a browser download allows. {EXPORT_CLI_HINT}")
+            return None
+        progress_bar.progress(1.0, text=f"Exported {result['rows']:,} rows in {result['seconds']:.1f}s")
+        with open(path, "rb") as f:
+            return f.read(), result
+    finally:
+        os.remove(path)
+
+def is_admin():
+    """Whether the logged-in user is listed under admins in the [app] secrets section"""
+    admins = st.secrets.get("app", {}).get("admins", [])
+    return st.session_state.logged_in and st.session_state.username in admins
+
 def logout():
     """Logout user"""
     st.session_state.logged_in = False
     st.session_state.user_id = None
     st.session_state.username = None
     st.session_state.page = "Home"
+    st.session_state.pop('watchlist_status', None)
+    st.session_state.pop('user_lists', None)
 
 # Main app
 def main():
+    # Tag every query issued during this rerun for the admin query panel
+    st.session_state.rerun_seq += 1
+    rerun_id = f"{st.session_state.session_key}:{st.session_state.rerun_seq}"
+    current_rerun.set({"id": rerun_id, "page": st.session_state.page if st.session_state.logged_in else "Home"})
+    
     # Header
     st.markdown('<h1 class="main-header">🎬 SIDRAMA</h1>', unsafe_allow_html=True)
     st.markdown('<p style="text-align: center; font-size: 1.2rem; color: #666;">Your Ultimate Movie & TV Show Review Platform</p>', 
@@ -136,14 +1204,18 @@ def main():
                     submit = st.form_submit_button("Login")
                     
                     if submit:
-                        user = login_user(username, password)
+                        try:
+                            user = login_user(username, password)
+                        except LoginBusy:
+                            st.warning("Too many sign-ins right now, please try again in a moment.")
+                            user = False
                         if user:
                             st.session_state.logged_in = True
                             st.session_state.user_id = user['user_id']
                             st.session_state.username = user['username']
                             st.success(f"Welcome back, {user['name']}!")
                             st.rerun()
-                        else:
+                        elif user is None:
                             st.error("Invalid credentials")
             
             else:  # Register
@@ -160,10 +1232,14 @@ def main():
                     
                     if submit:
                         if new_username and new_password and name and email:
-                            user_id = register_user(new_username, new_password, name, dob, email, ph_no, address)
+                            try:
+                                user_id = register_user(new_username, new_password, name, dob, email, ph_no, address)
+                            except LoginBusy:
+                                st.warning("Too many sign-ins right now, please try again in a moment.")
+                                user_id = False
                             if user_id:
                                 st.success("Registration successful! Please login.")
-                            else:
+                            elif user_id is None:
                                 st.error("Registration failed. Username or email may already exist.")
                         else:
                             st.error("Please fill in all required fields")
@@ -183,10 +1259,15 @@ def main():
                 "🎬 Movies": "Movies",
                 "📺 TV Shows": "TV Shows",
                 "⭐ My Reviews": "My Reviews",
+                "👥 Following": "Following",
+                "📋 My Lists": "My Lists",
+                "📤 Export": "Export",
                 "🔍 Search": "Search",
                 "📊 Statistics": "Statistics",
                 "👤 Profile": "Profile"
             }
+            if is_admin():
+                pages["🛠️ Admin"] = "Admin"
             
             for label, page in pages.items():
                 if st.button(label, use_container_width=True):
@@ -205,12 +1286,24 @@ def main():
             show_tvshows_page()
         elif st.session_state.page == "My Reviews":
             show_my_reviews_page()
+        elif st.session_state.page == "Following":
+            show_following_page()
+        elif st.session_state.page == "My Lists":
+            show_lists_page()
+        elif st.session_state.page == "Export":
+            show_export_page()
         elif st.session_state.page == "Search":
             show_search_page()
         elif st.session_state.page == "Statistics":
             show_statistics_page()
         elif st.session_state.page == "Profile":
             show_profile_page()
+        elif st.session_state.page == "Admin" and is_admin():
+            show_admin_page()
+    
+    if is_admin():
+        totals = get_query_log().rerun_totals(rerun_id)
+        st.sidebar.caption(f"🛠️ This run: {totals['queries']} queries, {totals['ms']:.0f} ms in SQL")
 
 def show_home_page():
     """Display home page with popular movies and shows"""
@@ -221,68 +1314,104 @@ def show_home_page():
     else:
         st.info("Please login or register to start reviewing movies and TV shows!")
     
-    # Display popular movies using view
-    st.subheader("🔥 Popular Movies")
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT m.*, pm.avg_rating, pm.total_reviews 
-            FROM popular_movies pm
-            JOIN Movie m ON pm.movie_id = m.movie_id
+    # Popular movies, trending titles and top shows are independent leaderboard
+    # reads (primary-key ranges), so they run concurrently with the user's recommendations
+    tasks = {}
+    if st.session_state.logged_in:
+        # Bounded by the movie_neighbors lists of the user's latest liked movies and a
+        # MAX_EXECUTION_TIME budget
+        tasks['recommended'] = (load_recommendations, st.session_state.user_id)
+    data = load_page_data(
+        **tasks,
+        movies=(cached_query, """
+            SELECT m.*, m.ratings AS avg_rating
+            FROM title_leaderboard lb
+            JOIN Movie m ON m.movie_id = lb.entity_id
+            WHERE lb.board = 'popular_movies'
+            ORDER BY lb.rank_no
             LIMIT 6
-        """)
-        movies = cursor.fetchall()
-        
-        if movies:
-            cols = st.columns(3)
-            for idx, movie in enumerate(movies):
-                with cols[idx % 3]:
-                    # Display poster image
-                    if movie.get('poster_url'):
-                        try:
-                            st.image(movie['poster_url'], use_container_width=True)
-                        except:
-                            st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
-                    else:
-                        st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
-                    
-                    st.markdown(f"### {movie['name']}")
-                    st.write(f"⭐ Rating: {movie['avg_rating']:.2f}/5.0")
-                    st.write(f"📝 {movie['total_reviews']} reviews")
-                    st.write(f"🗓️ {movie['release_date']}")
-                    st.write(f"🌐 {movie['language']}")
-        cursor.close()
-        conn.close()
+        """, (), LEADERBOARD_TTL, ("ratings",)),
+        trending=(cached_query, """
+            SELECT lb.rank_no, lb.entity_type, lb.recent_reviews, lb.recent_avg_rating,
+                   COALESCE(m.name, s.name) AS name
+            FROM title_leaderboard lb
+            LEFT JOIN Movie m ON lb.entity_type = 'Movie' AND m.movie_id = lb.entity_id
+            LEFT JOIN tvshow s ON lb.entity_type = 'TV Show' AND s.show_id = lb.entity_id
+            WHERE lb.board = 'trending'
+            ORDER BY lb.rank_no
+            LIMIT 5
+        """, (), LEADERBOARD_TTL, ("ratings",)),
+        shows=(cached_query, """
+            SELECT s.*
+            FROM title_leaderboard lb
+            JOIN tvshow s ON s.show_id = lb.entity_id
+            WHERE lb.board = 'top_shows'
+            ORDER BY lb.rank_no
+            LIMIT 4
+        """, (), LEADERBOARD_TTL, ("ratings",)),
+    )
+    movies, trending, shows = data['movies'], data['trending'], data['shows']
+    recommended = data.get('recommended')
+    # Every poster on the page is fetched in one concurrent batch
+    prefetch_images([title.get('poster_url') for title in (recommended or []) + (movies or []) + (shows or [])])
+    
+    if st.session_state.logged_in:
+        st.subheader("🎯 Recommended for You")
+        if recommended:
+            cols = st.columns(6)
+            for idx, movie in enumerate(recommended):
+                with cols[idx % 6]:
+                    st.image(poster_image(movie.get('poster_url')), use_container_width=True)
+                    st.markdown(f"**{movie['name']}**")
+                    st.caption(f"⭐ {movie['ratings']:.2f} · similar to {movie['supporting']} you liked")
+        elif 'recommended' in data.errors:
+            # Over the latency budget (or the neighbour table is missing): skip rather than wait
+            st.caption("Recommendations are unavailable right now.")
+        elif recommended is not None:
+            st.info("Rate a few movies 3.5 or higher to get personal recommendations.")
+        st.divider()
+    
+    # Display popular movies from the precomputed leaderboard
+    st.subheader("🔥 Popular Movies")
+    if movies:
+        cols = st.columns(3)
+        for idx, movie in enumerate(movies):
+            with cols[idx % 3]:
+                # Display poster image
+                st.image(poster_image(movie.get('poster_url')), use_container_width=True)
+                
+                st.markdown(f"### {movie['name']}")
+                st.write(f"⭐ Rating: {movie['avg_rating']:.2f}/5.0")
+                st.write(f"📝 {movie['total_reviews']} reviews")
+                st.write(f"🗓️ {movie['release_date']}")
+                st.write(f"🌐 {movie['language']}")
+    
+    st.divider()
+    
+    # Trending movies and shows (time-decayed recent reviews)
+    st.subheader("📈 Trending Now")
+    if trending:
+        for item in trending:
+            icon = "🎬" if item['entity_type'] == 'Movie' else "📺"
+            avg_rating = f"⭐ {item['recent_avg_rating']:.2f}" if item['recent_avg_rating'] is not None else ""
+            st.write(f"**{item['rank_no']}.** {icon} {item['name']} — {item['recent_reviews']} recent reviews {avg_rating}")
+    else:
+        st.info("Nothing trending yet.")
     
     st.divider()
     
     # Display top rated shows
     st.subheader("📺 Top Rated TV Shows")
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM tvshow ORDER BY ratings DESC LIMIT 4")
-        shows = cursor.fetchall()
-        
-        if shows:
-            cols = st.columns(2)
-            for idx, show in enumerate(shows):
-                with cols[idx % 2]:
-                    # Display show poster
-                    if show.get('poster_url'):
-                        try:
-                            st.image(show['poster_url'], use_container_width=True)
-                        except:
-                            st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
-                    else:
-                        st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
-                    
-                    st.markdown(f"### {show['name']}")
-                    st.write(f"⭐ Rating: {show['ratings']:.2f}/5.0")
-                    st.write(f"📺 {show['num_of_seasons']} seasons, {show['num_of_episodes']} episodes")
-        cursor.close()
-        conn.close()
+    if shows:
+        cols = st.columns(2)
+        for idx, show in enumerate(shows):
+            with cols[idx % 2]:
+                # Display show poster
+                st.image(poster_image(show.get('poster_url')), use_container_width=True)
+                
+                st.markdown(f"### {show['name']}")
+                st.write(f"⭐ Rating: {show['ratings']:.2f}/5.0")
+                st.write(f"📺 {show['num_of_seasons']} seasons, {show['num_of_episodes']} episodes")
 
 def show_movies_page():
     """Display movies page"""
@@ -294,155 +1423,161 @@ def show_movies_page():
         search_term = st.text_input("🔍 Search movies", placeholder="Enter movie name...")
     with col2:
         # Get genres
-        conn = get_db_connection()
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM Genre ORDER BY name")
-            genres = [g[0] for g in cursor.fetchall()]
-            cursor.close()
-            conn.close()
-            genre_filter = st.selectbox("Genre", ["All"] + genres)
+        genre_filter = None
+        genres = cached_query("SELECT name FROM Genre ORDER BY name",
+                              ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+        if genres is not None:
+            genre_filter = st.selectbox("Genre", ["All"] + [g[0] for g in genres])
     with col3:
         min_rating = st.slider("Min Rating", 0.0, 5.0, 0.0, 0.5)
     
-    # Fetch movies using direct query
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
+    # Fetch one keyset page of card headers; details load only for the opened card
+    page_cursor = get_page_cursor("movies_pager", (search_term, genre_filter, min_rating))
+    movies = None
+    with db_cursor(dictionary=True) as cursor:
+        if cursor:
+            query = """
+                SELECT
+                    m.movie_id,
+                    m.name,
+                    m.release_date,
+                    m.ratings,
+                    m.genres
+                FROM movie_card m
+                WHERE 1=1
+            """
+            params = []
         
-        # Build query dynamically - include all necessary fields and genres
-        query = """
-            SELECT DISTINCT
-                m.movie_id,
-                m.name,
-                m.release_date,
-                m.ratings,
-                m.language,
-                m.poster_url,
-                m.descr,
-                m.total_duration,
-                m.age_rating,
-                m.box_office,
-                GROUP_CONCAT(DISTINCT g.name ORDER BY g.name SEPARATOR ', ') as genres
-            FROM Movie m
-            LEFT JOIN Movie_Genre mg ON m.movie_id = mg.movie_id
-            LEFT JOIN Genre g ON mg.genre_id = g.genre_id
-            WHERE 1=1
-        """
-        params = []
-        
-        if search_term:
-            query += " AND m.name LIKE %s"
-            params.append(f"%{search_term}%")
+            if search_term:
+                boolean_query = to_boolean_query(search_term)
+                if boolean_query:
+                    # Uses the ft_movie_card_name FULLTEXT index instead of a leading-wildcard scan
+                    query += " AND MATCH(m.name) AGAINST (%s IN BOOLEAN MODE)"
+                    params.append(boolean_query)
+                else:
+                    query += " AND m.name LIKE %s"
+                    params.append(f"{search_term}%")
         
-        if genre_filter and genre_filter != "All":
-            query += " AND g.name = %s"
-            params.append(genre_filter)
+            if genre_filter and genre_filter != "All":
+                query += """ AND EXISTS (
+                    SELECT 1 FROM Movie_Genre mg JOIN Genre g ON mg.genre_id = g.genre_id
+                    WHERE mg.movie_id = m.movie_id AND g.name = %s
+                )"""
+                params.append(genre_filter)
         
-        if min_rating > 0:
-            query += " AND m.ratings >= %s"
-            params.append(min_rating)
+            if min_rating > 0:
+                query += " AND m.ratings >= %s"
+                params.append(min_rating)
+            
+            if page_cursor:
+                # Seek past the last row of the previous page on idx_movie_card_rating_release
+                predicate, predicate_params = rating_keyset_predicate("m", "movie_id", page_cursor)
+                query += f" AND {predicate}"
+                params.extend(predicate_params)
         
-        query += " GROUP BY m.movie_id, m.name, m.release_date, m.ratings, m.language, m.poster_url, m.descr, m.total_duration, m.age_rating, m.box_office"
-        query += " ORDER BY m.ratings DESC, m.release_date DESC LIMIT 50"
+            query += " ORDER BY m.ratings DESC, m.release_date DESC, m.movie_id DESC LIMIT %s"
+            params.append(PAGE_SIZE + 1)
         
-        cursor.execute(query, params)
-        movies = cursor.fetchall()
+            cursor.execute(query, params)
+            movies = cursor.fetchall()
         
-        if movies:
-            for movie in movies:
-                # Create expander title with genres
-                genres_display = f" | {movie['genres']}" if movie.get('genres') else ""
-                expander_title = f"**{movie['name']}** ⭐ {movie['ratings']:.2f}{genres_display}"
+            if movies:
+                movies = page_controls(
+                    "movies_pager", movies,
+                    lambda movie: (movie['ratings'], movie['release_date'], movie['movie_id'])
+                )
+                # Watchlist membership for the whole page in at most one query
+                watch_status = load_watchlist_status(cursor, 'movie', [movie['movie_id'] for movie in movies])
+    
+    # Render after the page connection is back in the pool: an opened card loads
+    # its details and likes on connections of its own, never nested in this one
+    if movies:
+        for movie in movies:
+            genres_display = f" | {movie['genres']}" if movie.get('genres') else ""
+            header = f"**{movie['name']}** ⭐ {movie['ratings']:.2f}{genres_display}"
+            if not card_header("open_movie", movie['movie_id'], header,
+                               watchlist=('movie', watch_status[movie['movie_id']])):
+                continue
+                    
+            detail, reviews = load_movie_detail(movie['movie_id'])
+            if detail is None:
+                continue
+            movie = {**movie, **detail}
+            like_state = load_card_likes(reviews)
                 
-                with st.expander(expander_title, expanded=False):
-                    # Create two columns: poster on left, details on right
-                    col_poster, col_details = st.columns([1, 2])
+            with st.container(border=True):
+                # Create two columns: poster on left, details on right
+                col_poster, col_details = st.columns([1, 2])
                     
-                    with col_poster:
-                        # Display movie poster
-                        if movie.get('poster_url'):
-                            try:
-                                st.image(movie['poster_url'], use_container_width=True)
-                            except:
-                                st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
-                        else:
-                            st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
+                with col_poster:
+                    # Display movie poster
+                    st.image(poster_image(movie.get('poster_url')), use_container_width=True)
                     
-                    with col_details:
-                        # Movie details section
-                        st.markdown(f"### {movie['name']}")
+                with col_details:
+                    # Movie details section
+                    st.markdown(f"### {movie['name']}")
                         
-                        # Genres with badges (using markdown)
-                        if movie.get('genres'):
-                            genres_list = movie['genres'].split(', ')
-                            genres_badges = ' '.join([f'`{genre}`' for genre in genres_list])
-                            st.markdown(f"**Genres:** {genres_badges}")
+                    # Genres with badges (using markdown)
+                    if movie.get('genres'):
+                        genres_list = movie['genres'].split(', ')
+                        genres_badges = ' '.join([f'`{genre}`' for genre in genres_list])
+                        st.markdown(f"**Genres:** {genres_badges}")
                         
-                        # Description - prominently displayed
-                        if movie.get('descr'):
-                            st.markdown(f"**Synopsis:**")
-                            st.info(movie['descr'])
+                    # Description - prominently displayed
+                    if movie.get('descr'):
+                        st.markdown(f"**Synopsis:**")
+                        st.info(movie['descr'])
                         
-                        # Other details in columns
-                        detail_col1, detail_col2 = st.columns(2)
+                    # Other details in columns
+                    detail_col1, detail_col2 = st.columns(2)
                         
-                        with detail_col1:
-                            st.write(f"📅 **Release:** {movie['release_date']}")
-                            st.write(f"🌐 **Language:** {movie['language']}")
-                            st.write(f"🔞 **Age Rating:** {movie['age_rating']}")
+                    with detail_col1:
+                        st.write(f"📅 **Release:** {movie['release_date']}")
+                        st.write(f"🌐 **Language:** {movie['language']}")
+                        st.write(f"🔞 **Age Rating:** {movie['age_rating']}")
                         
-                        with detail_col2:
-                            if movie.get('total_duration'):
-                                st.write(f"⏱️ **Duration:** {movie['total_duration']} min")
-                            if movie.get('box_office'):
-                                st.write(f"💰 **Box Office:** ${movie['box_office']:,}")
-                            st.write(f"⭐ **Rating:** {movie['ratings']:.2f}/5.0")
+                    with detail_col2:
+                        if movie.get('total_duration'):
+                            st.write(f"⏱️ **Duration:** {movie['total_duration']} min")
+                        if movie.get('box_office'):
+                            st.write(f"💰 **Box Office:** ${movie['box_office']:,}")
+                        st.write(f"⭐ **Rating:** {movie['ratings']:.2f}/5.0")
                         
-                        # Get directors from view
-                        cursor.execute("SELECT directors FROM movie_details_view WHERE movie_id = %s", (movie['movie_id'],))
-                        details = cursor.fetchone()
-                        if details and details.get('directors'):
-                            st.write(f"🎬 **Directors:** {details['directors']}")
+                    # Cast and crew from the movie card
+                    if movie.get('directors'):
+                        st.write(f"🎬 **Directors:** {movie['directors']}")
+                    if movie.get('actors'):
+                        st.write(f"🎭 **Cast:** {movie['actors']}")
                         
-                        # Review button
-                        st.divider()
-                        col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
-                        with col_btn2:
-                            if st.button(f"✍️ Write a Review", key=f"review_movie_{movie['movie_id']}", use_container_width=True):
-                                st.session_state.reviewing_movie = movie['movie_id']
-                                st.session_state.reviewing_movie_name = movie['name']
-                                st.rerun()
-                    
-                    # Show recent reviews (full width below)
-                    cursor.execute("""
-                        SELECT * FROM movie_reviews_view 
-                        WHERE movie_name = %s 
-                        ORDER BY review_date DESC 
-                        LIMIT 5
-                    """, (movie['name'],))
-                    reviews = cursor.fetchall()
+                    # Review button
+                    st.divider()
+                    col_btn1, col_btn2, col_btn3 = st.columns([1, 2, 1])
+                    with col_btn2:
+                        if st.button(f"✍️ Write a Review", key=f"review_movie_{movie['movie_id']}", use_container_width=True):
+                            st.session_state.reviewing_movie = movie['movie_id']
+                            st.session_state.reviewing_movie_name = movie['name']
+                            st.rerun()
+                    list_picker('movie', movie['movie_id'])
                     
-                    if reviews:
-                        st.divider()
-                        st.markdown("### 💬 Recent Reviews")
-                        for review in reviews:
-                            with st.container():
-                                col_review1, col_review2 = st.columns([4, 1])
-                                with col_review1:
-                                    st.markdown(f"**{review['username']}** - {review['review_date']}")
-                                    st.write(review['review_text'])
-                                with col_review2:
-                                    st.metric("Rating", f"{review['rating']:.1f}/5")
-                                st.caption("---")
-                    else:
-                        st.divider()
-                        st.info("No reviews yet. Be the first to review this movie!")
-        else:
-            st.info("No movies found matching your criteria.")
-        
-        cursor.close()
-        conn.close()
+                # Show recent reviews (full width below)
+                if reviews:
+                    st.divider()
+                    st.markdown("### 💬 Recent Reviews")
+                    for review in reviews:
+                        with st.container():
+                            col_review1, col_review2 = st.columns([4, 1])
+                            with col_review1:
+                                st.markdown(f"**{review['username']}** - {review['review_date']}")
+                                st.write(review['review_text'])
+                            with col_review2:
+                                st.metric("Rating", f"{review['rating']:.1f}/5")
+                                like_button(review, like_state, "like_movie_review")
+                            st.caption("---")
+                else:
+                    st.divider()
+                    st.info("No reviews yet. Be the first to review this movie!")
+    elif movies is not None:
+        st.info("No movies found matching your criteria.")
     
     # Review form
     if 'reviewing_movie' in st.session_state and st.session_state.reviewing_movie:
@@ -465,43 +1600,48 @@ def show_movies_page():
                     st.error("Please write a review before submitting!")
                 else:
                     # Direct INSERT instead of stored procedure
-                    conn = get_db_connection()
-                    if conn:
-                        cursor = conn.cursor()
-                        try:
-                            # Check if user already reviewed this movie
-                            cursor.execute("""
-                                SELECT review_id FROM Review 
-                                WHERE user_id = %s AND movie_id = %s
-                            """, (st.session_state.user_id, st.session_state.reviewing_movie))
-                            
-                            existing_review = cursor.fetchone()
-                            
-                            if existing_review:
-                                st.error("You have already reviewed this movie!")
-                            else:
-                                # Insert the review (trigger will auto-update movie rating)
+                    submitted = False
+                    with db_connection() as conn:
+                        if conn:
+                            cursor = conn.cursor()
+                            try:
+                                # Check if user already reviewed this movie
                                 cursor.execute("""
-                                    INSERT INTO Review (user_id, movie_id, date, rating, review_text)
-                                    VALUES (%s, %s, CURDATE(), %s, %s)
-                                """, (
-                                    st.session_state.user_id,
-                                    st.session_state.reviewing_movie,
-                                    rating,
-                                    review_text
-                                ))
-                                conn.commit()
-                                st.success("✅ Review submitted successfully! Movie rating updated automatically.")
-                                del st.session_state.reviewing_movie
-                                del st.session_state.reviewing_movie_name
+                                    SELECT review_id FROM Review 
+                                    WHERE user_id = %s AND movie_id = %s
+                                """, (st.session_state.user_id, st.session_state.reviewing_movie))
+                                
+                                existing_review = cursor.fetchone()
+                                
+                                if existing_review:
+                                    st.error("You have already reviewed this movie!")
+                                else:
+                                    # Insert the review (trigger will auto-update movie rating)
+                                    cursor.execute("""
+                                        INSERT INTO Review (user_id, movie_id, date, rating, review_text)
+                                        VALUES (%s, %s, CURDATE(), %s, %s)
+                                    """, (
+                                        st.session_state.user_id,
+                                        st.session_state.reviewing_movie,
+                                        rating,
+                                        review_text
+                                    ))
+                                    conn.commit()
+                                    # Ratings changed: drop cached listings before the rerun reads them
+                                    get_query_cache().invalidate("ratings")
+                                    get_recommendation_cache().invalidate(f"user:{st.session_state.user_id}")
+                                    submitted = True
+                            except mysql.connector.Error as e:
+                                st.error(f"❌ Error submitting review: {e}")
+                                conn.rollback()
+                            finally:
                                 cursor.close()
-                                conn.close()
-                                st.rerun()
-                        except mysql.connector.Error as e:
-                            st.error(f"❌ Error submitting review: {e}")
-                            conn.rollback()
-                            cursor.close()
-                            conn.close()
+                    
+                    if submitted:
+                        st.success("✅ Review submitted successfully! Movie rating updated automatically.")
+                        del st.session_state.reviewing_movie
+                        del st.session_state.reviewing_movie_name
+                        st.rerun()
             
             if cancel:
                 del st.session_state.reviewing_movie
@@ -513,109 +1653,149 @@ def show_tvshows_page():
     """Display TV shows page"""
     st.header("📺 TV Shows")
     
-    # Fetch TV shows
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT s.*, GROUP_CONCAT(DISTINCT g.name SEPARATOR ', ') as genres
-            FROM tvshow s
-            LEFT JOIN Show_Genre sg ON s.show_id = sg.show_id
-            LEFT JOIN Genre g ON sg.genre_id = g.genre_id
-            GROUP BY s.show_id
-            ORDER BY s.ratings DESC
-        """)
-        shows = cursor.fetchall()
-        
-        if shows:
-            for show in shows:
-                with st.expander(f"**{show['name']}** ⭐ {show['ratings']:.2f}", expanded=False):
-                    # Create two columns: poster on left, details on right
-                    col_poster, col_details = st.columns([1, 2])
+    # Fetch one keyset page of card headers (shared cache, dropped on review writes);
+    # details and reviews load only for the opened card
+    page_cursor = get_page_cursor("shows_pager")
+    query = "SELECT s.show_id, s.name, s.release_date, s.ratings, s.num_of_seasons, s.genres FROM show_card s"
+    params = []
+    if page_cursor:
+        predicate, predicate_params = rating_keyset_predicate("s", "show_id", page_cursor)
+        query += f" WHERE {predicate}"
+        params.extend(predicate_params)
+    query += " ORDER BY s.ratings DESC, s.release_date DESC, s.show_id DESC LIMIT %s"
+    params.append(PAGE_SIZE + 1)
+    shows = cached_query(query, params, ttl=RATINGS_TTL, tags=("ratings",))
+    
+    if shows:
+        shows = page_controls(
+            "shows_pager", shows,
+            lambda show: (show['ratings'], show['release_date'], show['show_id'])
+        )
+        # Watchlist membership for the whole page in at most one query
+        watch_status = None
+        with db_cursor(dictionary=True) as cursor:
+            if cursor:
+                watch_status = load_watchlist_status(cursor, 'show', [show['show_id'] for show in shows])
+    
+    # Render after the watchlist connection is back in the pool (see show_movies_page)
+    if shows and watch_status is not None:
+        for show in shows:
+            genres_display = f" | {show['genres']}" if show['genres'] else ""
+            header = f"**{show['name']}** ⭐ {show['ratings']:.2f} · {show['num_of_seasons']} seasons{genres_display}"
+            if not card_header("open_show", show['show_id'], header,
+                               watchlist=('show', watch_status[show['show_id']])):
+                continue
                     
-                    with col_poster:
-                        # Display show poster
-                        if show.get('poster_url'):
-                            try:
-                                st.image(show['poster_url'], use_container_width=True)
-                            except:
-                                st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
-                        else:
-                            st.image("https://via.placeholder.com/300x450?text=No+Poster", use_container_width=True)
+            detail, reviews = load_show_detail(show['show_id'])
+            if detail is None:
+                continue
+            show = {**show, **detail}
+            like_state = load_card_likes(reviews)
+                    
+            with st.container(border=True):
+                # Create two columns: poster on left, details on right
+                col_poster, col_details = st.columns([1, 2])
+                    
+                with col_poster:
+                    # Display show poster
+                    st.image(poster_image(show.get('poster_url')), use_container_width=True)
                     
-                    with col_details:
-                        col1, col2 = st.columns([3, 1])
+                with col_details:
+                    col1, col2 = st.columns([3, 1])
                         
-                        with col1:
-                            st.write(f"**Seasons:** {show['num_of_seasons']} | **Episodes:** {show['num_of_episodes']}")
-                            st.write(f"**Release Date:** {show['release_date']}")
-                            st.write(f"**Language:** {show['language']}")
-                            st.write(f"**Status:** {show['status']}")
-                            st.write(f"**Age Rating:** {show['age_rating']}")
+                    with col1:
+                        st.write(f"**Seasons:** {show['num_of_seasons']} | **Episodes:** {show['num_of_episodes']}")
+                        st.write(f"**Release Date:** {show['release_date']}")
+                        st.write(f"**Language:** {show['language']}")
+                        st.write(f"**Status:** {show['status']}")
+                        st.write(f"**Age Rating:** {show['age_rating']}")
                             
-                            if show['genres']:
-                                st.write(f"**Genres:** {show['genres']}")
-                            if show['descr']:
-                                st.write(f"**Description:** {show['descr']}")
+                        if show['genres']:
+                            st.write(f"**Genres:** {show['genres']}")
+                        if show['descr']:
+                            st.write(f"**Description:** {show['descr']}")
                         
-                        with col2:
-                            if st.button("📺 View Episodes", key=f"view_episodes_{show['show_id']}", use_container_width=True):
-                                st.session_state.viewing_show = show['show_id']
-                                st.session_state.viewing_show_name = show['name']
-                                st.rerun()
+                    with col2:
+                        if st.button("📺 View Episodes", key=f"view_episodes_{show['show_id']}", use_container_width=True):
+                            st.session_state.viewing_show = show['show_id']
+                            st.session_state.viewing_show_name = show['name']
+                            st.rerun()
+                    list_picker('show', show['show_id'])
                     
-                    # Show episode reviews (full width below)
-                    cursor.execute("""
-                        SELECT * FROM episode_reviews_view 
-                        WHERE show_name = %s 
-                        ORDER BY review_date DESC LIMIT 3
-                    """, (show['name'],))
-                    reviews = cursor.fetchall()
-                    if reviews:
-                        st.divider()
-                        st.write("**Recent Episode Reviews:**")
-                        for review in reviews:
+                # Show episode reviews (full width below)
+                if reviews:
+                    st.divider()
+                    st.write("**Recent Episode Reviews:**")
+                    for review in reviews:
+                        col_review, col_like = st.columns([5, 1])
+                        with col_review:
                             st.caption(f"⭐ {review['rating']}/5 - S{review['season_number']}E{review['episode_no']} - **{review['username']}**: {review['review_text'][:100]}...")
-        
-        cursor.close()
-        conn.close()
+                        with col_like:
+                            like_button(review, like_state, "like_episode_review")
     
     # Episode list and review
     if 'viewing_show' in st.session_state and st.session_state.viewing_show:
         st.divider()
         st.subheader(f"Episodes: {st.session_state.viewing_show_name}")
         
-        conn = get_db_connection()
-        if conn:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT * FROM Episode 
-                WHERE show_id = %s 
-                ORDER BY season_number, episode_no
-            """, (st.session_state.viewing_show,))
-            episodes = cursor.fetchall()
-            
-            if episodes:
-                for episode in episodes:
-                    with st.container():
-                        col1, col2, col3 = st.columns([3, 1, 1])
-                        with col1:
-                            st.write(f"**S{episode['season_number']}E{episode['episode_no']}** - {episode['title'] if episode['title'] else 'Episode ' + str(episode['episode_no'])}")
-                            if episode['ep_descr']:
-                                st.caption(episode['ep_descr'])
-                        with col2:
-                            st.caption(f"⏱️ {episode['duration']} min")
-                            if episode['air_date']:
-                                st.caption(f"📅 {episode['air_date']}")
-                        with col3:
-                            if st.button("✍️ Review", key=f"review_ep_{episode['episode_id']}", use_container_width=True):
-                                st.session_state.reviewing_episode = episode['episode_id']
-                                st.session_state.reviewing_episode_name = f"S{episode['season_number']}E{episode['episode_no']}"
-                                st.rerun()
-                        st.divider()
+        # Per-season averages straight from the trigger-maintained season_stats rows
+        seasons = cached_query("""
+            SELECT season_number, total_reviews, rating_sum / NULLIF(rating_count, 0) AS avg_rating
+            FROM season_stats
+            WHERE show_id = %s AND total_reviews > 0
+            ORDER BY season_number
+        """, (st.session_state.viewing_show,), ttl=RATINGS_TTL, tags=("ratings",))
+        if seasons:
+            for start in range(0, len(seasons), 4):
+                season_cols = st.columns(4)
+                for col, season in zip(season_cols, seasons[start:start + 4]):
+                    with col:
+                        st.metric(
+                            f"Season {season['season_number']}",
+                            f"⭐ {season['avg_rating']:.2f}" if season['avg_rating'] is not None else "—",
+                            f"{season['total_reviews']} reviews",
+                            delta_color="off"
+                        )
+        
+        page_cursor = get_page_cursor("episodes_pager", st.session_state.viewing_show)
+        with db_cursor(dictionary=True) as cursor:
+            if cursor:
+                query = "SELECT * FROM Episode WHERE show_id = %s"
+                params = [st.session_state.viewing_show]
+                if page_cursor:
+                    query += " AND (season_number, episode_no, episode_id) > (%s, %s, %s)"
+                    params.extend(page_cursor)
+                query += " ORDER BY season_number, episode_no, episode_id LIMIT %s"
+                params.append(PAGE_SIZE + 1)
+                cursor.execute(query, params)
+                episodes = cursor.fetchall()
             
-            cursor.close()
-            conn.close()
+                if episodes:
+                    episodes = page_controls(
+                        "episodes_pager", episodes,
+                        lambda episode: (episode['season_number'], episode['episode_no'], episode['episode_id'])
+                    )
+                    for episode in episodes:
+                        with st.container():
+                            col1, col2, col3 = st.columns([3, 1, 1])
+                            with col1:
+                                st.write(f"**S{episode['season_number']}E{episode['episode_no']}** - {episode['title'] if episode['title'] else 'Episode ' + str(episode['episode_no'])}")
+                                if episode['ep_descr']:
+                                    st.caption(episode['ep_descr'])
+                            with col2:
+                                st.caption(f"⏱️ {episode['duration']} min")
+                                if episode['air_date']:
+                                    st.caption(f"📅 {episode['air_date']}")
+                                if episode['rating_count']:
+                                    st.caption(f"⭐ {episode['ratings']:.2f} ({episode['total_reviews']} reviews)")
+                                else:
+                                    st.caption("No ratings yet")
+                            with col3:
+                                if st.button("✍️ Review", key=f"review_ep_{episode['episode_id']}", use_container_width=True):
+                                    st.session_state.reviewing_episode = episode['episode_id']
+                                    st.session_state.reviewing_episode_name = f"S{episode['season_number']}E{episode['episode_no']}"
+                                    st.rerun()
+                            st.divider()
         
         if st.button("← Back to Shows", use_container_width=False):
             del st.session_state.viewing_show
@@ -637,25 +1817,29 @@ def show_tvshows_page():
                 cancel = st.form_submit_button("Cancel")
             
             if submit:
-                conn = get_db_connection()
-                if conn:
-                    cursor = conn.cursor()
-                    try:
-                        cursor.execute("""
-                            INSERT INTO Review (user_id, episode_id, date, rating, review_text)
-                            VALUES (%s, %s, CURDATE(), %s, %s)
-                        """, (st.session_state.user_id, st.session_state.reviewing_episode, rating, review_text))
-                        conn.commit()
-                        st.success("✅ Review submitted successfully!")
-                        del st.session_state.reviewing_episode
-                        del st.session_state.reviewing_episode_name
-                        cursor.close()
-                        conn.close()
-                        st.rerun()
-                    except mysql.connector.Error as e:
-                        st.error(f"❌ Error: {e}")
-                        cursor.close()
-                        conn.close()
+                submitted = False
+                with db_connection() as conn:
+                    if conn:
+                        cursor = conn.cursor()
+                        try:
+                            cursor.execute("""
+                                INSERT INTO Review (user_id, episode_id, date, rating, review_text)
+                                VALUES (%s, %s, CURDATE(), %s, %s)
+                            """, (st.session_state.user_id, st.session_state.reviewing_episode, rating, review_text))
+                            conn.commit()
+                            get_query_cache().invalidate("ratings")
+                            submitted = True
+                        except mysql.connector.Error as e:
+                            st.error(f"❌ Error: {e}")
+                            conn.rollback()
+                        finally:
+                            cursor.close()
+                
+                if submitted:
+                    st.success("✅ Review submitted successfully!")
+                    del st.session_state.reviewing_episode
+                    del st.session_state.reviewing_episode_name
+                    st.rerun()
             
             if cancel:
                 del st.session_state.reviewing_episode
@@ -666,74 +1850,423 @@ def show_my_reviews_page():
     """Display user's reviews using stored procedure"""
     st.header("⭐ My Reviews")
     
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        
-        # Use stored procedure to get user reviews
-        cursor.callproc('get_user_reviews', [st.session_state.user_id])
+    page_cursor = get_page_cursor("my_reviews_pager", st.session_state.user_id)
+    before_date, before_review_id = page_cursor or (None, None)
+    with db_cursor(dictionary=True) as cursor:
+        if cursor:
+            # Use stored procedure to get one keyset page of user reviews
+            cursor.callproc('get_user_reviews_page',
+                            [st.session_state.user_id, before_date, before_review_id, PAGE_SIZE + 1])
         
-        reviews = []
-        for result in cursor.stored_results():
-            reviews = result.fetchall()
+            reviews = []
+            for result in cursor.stored_results():
+                reviews = result.fetchall()
         
-        if reviews:
-            st.write(f"**Total Reviews:** {len(reviews)}")
+            if reviews:
+                cursor.execute("SELECT total_reviews FROM user_stats WHERE user_id = %s", (st.session_state.user_id,))
+                stats = cursor.fetchone()
+                st.write(f"**Total Reviews:** {stats['total_reviews'] if stats else len(reviews)}")
+                
+                reviews = page_controls("my_reviews_pager", reviews,
+                                        lambda review: (review['date'], review['review_id']))
             
-            for review in reviews:
-                with st.container():
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    with col1:
-                        st.write(f"**{review['content_name']}** ({review['content_type']})")
-                        st.caption(review['review_text'])
-                    with col2:
-                        st.metric("Rating", f"{review['rating']:.1f}/5")
-                    with col3:
-                        st.caption(f"📅 {review['date']}")
-                    st.divider()
-        else:
-            st.info("You haven't written any reviews yet. Start exploring movies and TV shows!")
+                for review in reviews:
+                    with st.container():
+                        col1, col2, col3 = st.columns([3, 1, 1])
+                        with col1:
+                            st.write(f"**{review['content_name']}** ({review['content_type']})")
+                            st.caption(review['review_text'])
+                        with col2:
+                            st.metric("Rating", f"{review['rating']:.1f}/5")
+                        with col3:
+                            st.caption(f"📅 {review['date']}")
+                        st.divider()
+            else:
+                st.info("You haven't written any reviews yet. Start exploring movies and TV shows!")
+
+def set_following(username, follow):
+    """Follow or unfollow a user by username; the User_Followers triggers maintain the feed inbox"""
+    with db_connection() as conn:
+        if conn:
+            cursor = conn.cursor()
+            try:
+                if follow:
+                    cursor.execute("""
+                        INSERT IGNORE INTO User_Followers (follower_id, following_id)
+                        SELECT %s, user_id FROM User WHERE username = %s AND user_id <> %s
+                    """, (st.session_state.user_id, username, st.session_state.user_id))
+                else:
+                    cursor.execute("""
+                        DELETE uf FROM User_Followers uf
+                        JOIN User u ON u.user_id = uf.following_id
+                        WHERE uf.follower_id = %s AND u.username = %s
+                    """, (st.session_state.user_id, username))
+                conn.commit()
+                return cursor.rowcount > 0
+            except mysql.connector.Error as e:
+                conn.rollback()
+                st.error(f"❌ Error updating follows: {e}")
+                return False
+            finally:
+                cursor.close()
+    return False
+
+def show_following_page():
+    """Recent reviews from the people the user follows"""
+    st.header("👥 Following")
+    
+    with st.expander("Manage who you follow"):
+        with st.form("follow_form", clear_on_submit=True):
+            col_name, col_btn = st.columns([3, 1])
+            with col_name:
+                follow_name = st.text_input("Username", label_visibility="collapsed", placeholder="Username to follow...")
+            with col_btn:
+                submit = st.form_submit_button("Follow", use_container_width=True)
+            if submit and follow_name.strip():
+                if set_following(follow_name.strip(), True):
+                    st.session_state.pop("feed_pager", None)
+                    st.success(f"Now following {follow_name.strip()}")
+                else:
+                    st.warning("No such user, or you already follow them.")
+        
+        followed_users = []
+        with db_cursor(dictionary=True) as cursor:
+            if cursor:
+                cursor.execute("""
+                    SELECT u.username, COALESCE(us.followers_count, 0) AS followers_count
+                    FROM User_Followers uf
+                    JOIN User u ON u.user_id = uf.following_id
+                    LEFT JOIN user_stats us ON us.user_id = uf.following_id
+                    WHERE uf.follower_id = %s
+                    ORDER BY u.username
+                """, (st.session_state.user_id,))
+                followed_users = cursor.fetchall()
+        # Unfollow writes on its own connection, so render after this one is returned
+        for followed in followed_users:
+            col_name, col_btn = st.columns([3, 1])
+            with col_name:
+                st.write(f"**{followed['username']}** · {followed['followers_count']} followers")
+            with col_btn:
+                if st.button("Unfollow", key=f"unfollow_{followed['username']}", use_container_width=True):
+                    set_following(followed['username'], False)
+                    st.session_state.pop("feed_pager", None)
+                    st.rerun()
+    
+    page_cursor = get_page_cursor("feed_pager", st.session_state.user_id)
+    before_date, before_review_id = page_cursor or (None, None)
+    reviews, like_state = None, {}
+    with db_cursor(dictionary=True) as cursor:
+        if cursor:
+            # Inbox rows merged with high-follower authors' reviews, one keyset page
+            cursor.callproc('get_following_feed_page',
+                            [st.session_state.user_id, before_date, before_review_id, PAGE_SIZE + 1])
+            reviews = []
+            for result in cursor.stored_results():
+                reviews = result.fetchall()
+            like_state = load_like_state(
+                cursor, st.session_state.user_id, [review['review_id'] for review in reviews]
+            )
+    
+    # Render after the feed connection is back in the pool: Like writes on its own
+    if reviews:
+        reviews = page_controls("feed_pager", reviews,
+                                lambda review: (review['review_date'], review['review_id']))
+        for review in reviews:
+            with st.container():
+                col1, col2, col3 = st.columns([3, 1, 1])
+                with col1:
+                    st.write(f"**{review['username']}** on **{review['content_name']}** ({review['content_type']})")
+                    st.caption(review['review_text'])
+                with col2:
+                    st.metric("Rating", f"{review['rating']:.1f}/5")
+                with col3:
+                    st.caption(f"📅 {review['review_date']}")
+                    like_button(review, like_state, "like_feed_review")
+                st.divider()
+    elif reviews is not None:
+        st.info("No recent reviews from people you follow. Follow some reviewers to fill your feed!")
+
+def show_lists_page():
+    """Watchlist and custom lists"""
+    st.header("📋 My Lists")
+    tab_watchlist, tab_lists = st.tabs(["Watchlist", "Custom Lists"])
+    
+    with tab_watchlist:
+        items = None
+        with db_cursor(dictionary=True) as cursor:
+            if cursor:
+                cursor.execute("""
+                    SELECT w.movie_id, w.show_id, w.watched, w.added_date,
+                           COALESCE(m.name, s.name) AS name,
+                           COALESCE(m.ratings, s.ratings) AS ratings
+                    FROM Watchlist w
+                    LEFT JOIN Movie m ON m.movie_id = w.movie_id
+                    LEFT JOIN tvshow s ON s.show_id = w.show_id
+                    WHERE w.user_id = %s
+                    ORDER BY w.watched, w.added_date DESC
+                """, (st.session_state.user_id,))
+                items = cursor.fetchall()
+        # Remove writes on its own connection, so render after this one is returned
+        if items is not None:
+            if items:
+                watched_count = sum(1 for item in items if item['watched'])
+                st.caption(f"{len(items)} titles · {watched_count} watched")
+            for item in items:
+                kind, title_id = ('movie', item['movie_id']) if item['movie_id'] else ('show', item['show_id'])
+                col_name, col_watched, col_remove = st.columns([4, 1, 1])
+                with col_name:
+                    icon = "🎬" if kind == 'movie' else "📺"
+                    st.write(f"{icon} **{item['name']}** ⭐ {item['ratings']:.2f}")
+                with col_watched:
+                    st.checkbox("Watched", value=bool(item['watched']), key=f"watched_{kind}_{title_id}",
+                                on_change=set_watched, args=(kind, title_id, not item['watched']))
+                with col_remove:
+                    if st.button("Remove", key=f"unwatch_{kind}_{title_id}", use_container_width=True):
+                        if set_watchlist(kind, title_id, False):
+                            st.rerun()
+            if not items:
+                st.info("Your watchlist is empty. Use ☆ Watchlist on the Movies and TV Shows pages.")
+    
+    with tab_lists:
+        with st.form("create_list_form", clear_on_submit=True):
+            st.subheader("New List")
+            list_name = st.text_input("Name", max_chars=100)
+            description = st.text_area("Description", height=80)
+            is_public = st.checkbox("Public", value=True)
+            if st.form_submit_button("Create List"):
+                if not list_name.strip():
+                    st.error("Please give the list a name.")
+                else:
+                    with db_connection() as conn:
+                        if conn:
+                            cursor = conn.cursor()
+                            try:
+                                cursor.execute("""
+                                    INSERT INTO User_List (user_id, list_name, description, is_public)
+                                    VALUES (%s, %s, %s, %s)
+                                """, (st.session_state.user_id, list_name.strip(), description or None, is_public))
+                                conn.commit()
+                                st.session_state.user_lists = None
+                                st.success(f"✅ Created {list_name.strip()}")
+                            except mysql.connector.Error as e:
+                                conn.rollback()
+                                st.error(f"❌ Error creating list: {e}")
+                            finally:
+                                cursor.close()
+        
+        lists = load_user_lists()
+        if not lists:
+            st.info("You have no custom lists yet.")
+            return
+        list_names = dict(lists)
+        
+        # Items of every list in one query, grouped per list
+        items_by_list = defaultdict(list)
+        with db_cursor(dictionary=True) as cursor:
+            if cursor:
+                cursor.execute("""
+                    SELECT li.list_id, li.list_item_id, COALESCE(m.name, s.name) AS name,
+                           CASE WHEN li.movie_id IS NOT NULL THEN 'Movie' ELSE 'TV Show' END AS content_type
+                    FROM User_List ul
+                    JOIN List_Items li ON li.list_id = ul.list_id
+                    LEFT JOIN Movie m ON m.movie_id = li.movie_id
+                    LEFT JOIN tvshow s ON s.show_id = li.show_id
+                    WHERE ul.user_id = %s
+                    ORDER BY li.list_id, li.added_date DESC
+                """, (st.session_state.user_id,))
+                for item in cursor.fetchall():
+                    items_by_list[item['list_id']].append(item)
         
-        cursor.close()
-        conn.close()
+        for list_id, list_name in lists:
+            items = items_by_list[list_id]
+            with st.expander(f"**{list_name}** ({len(items)})"):
+                if not items:
+                    st.caption("No titles yet. Add some from an opened movie or show card.")
+                    continue
+                labels = {item['list_item_id']: f"{item['name']} ({item['content_type']})" for item in items}
+                selected = st.multiselect("Titles", list(labels), format_func=labels.get,
+                                          key=f"list_select_{list_id}")
+                targets = [other_id for other_id, _ in lists if other_id != list_id]
+                col_target, col_move, col_remove = st.columns([2, 1, 1])
+                with col_target:
+                    target = st.selectbox("Move to", targets, format_func=list_names.get,
+                                          key=f"list_target_{list_id}", disabled=not targets)
+                with col_move:
+                    if st.button("Move", key=f"list_move_{list_id}", disabled=not (selected and targets),
+                                 use_container_width=True):
+                        if move_list_items(selected, list_id, target):
+                            st.rerun()
+                with col_remove:
+                    if st.button("Remove", key=f"list_remove_{list_id}", disabled=not selected,
+                                 use_container_width=True):
+                        if move_list_items(selected, list_id):
+                            st.rerun()
+
+def show_export_page():
+    """CSV / Parquet export of reviews and catalog slices"""
+    st.header("📤 Export")
+    st.caption("Exports stream from the database in fixed-size chunks straight to a file, "
+               "so large ones do not need to fit in memory.")
+    
+    source = st.radio("Data", ["My reviews", "Reviews of a title", "Catalog slice"], horizontal=True)
+    query = None
+    if source == "My reviews":
+        query = exports.user_reviews(st.session_state.user_id)
+    elif source == "Reviews of a title":
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            kind = st.radio("Type", ["Movie", "TV Show"], key="export_title_kind")
+        with col2:
+            term = st.text_input("Title", placeholder="Start typing a title...", key="export_title_term")
+        if term:
+            titles = find_titles(kind, term)
+            if titles:
+                title_id = st.selectbox("Matching titles", [title[0] for title in titles],
+                                        format_func=dict(titles).get)
+                query = exports.movie_reviews(title_id) if kind == "Movie" else exports.show_reviews(title_id)
+            elif titles is not None:
+                st.info("No matching titles.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            kind = st.radio("Catalog", ["movies", "shows"], format_func=str.title, key="export_catalog_kind")
+        title_table = "Movie" if kind == "movies" else "tvshow"
+        genre_rows = cached_query("SELECT name FROM Genre ORDER BY name",
+                                  ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+        language_rows = cached_query(f"SELECT DISTINCT language FROM {title_table} "
+                                     "WHERE language IS NOT NULL ORDER BY language",
+                                     ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+        with col2:
+            genre = st.selectbox("Genre", ["Any"] + [g[0] for g in genre_rows or []], key="export_genre")
+        with col3:
+            language = st.selectbox("Language", ["Any"] + [l[0] for l in language_rows or []], key="export_language")
+        with col4:
+            min_rating = st.slider("Min Rating", 0.0, 5.0, 0.0, 0.5, key="export_min_rating")
+        query = exports.catalog_slice(kind, genre if genre != "Any" else None,
+                                      language if language != "Any" else None, min_rating or None)
+    
+    fmt = st.radio("Format", exports.FORMATS, format_func=str.upper, horizontal=True)
+    if query and st.button("Prepare Export", type="primary"):
+        prepared = run_export(query, fmt)
+        if prepared:
+            # Offered only in the run that prepared it, so the file reaches the media store
+            # once rather than on every rerun of the page
+            data, result = prepared
+            st.caption(f"{query.name}.{fmt}: {result['rows']:,} rows, {result['bytes'] / 1e6:,.1f} MB")
+            st.download_button(
+                f"Download {fmt.upper()}",
+                data=data,
+                file_name=f"{query.name}.{fmt}",
+                mime="text/csv" if fmt == "csv" else "application/vnd.apache.parquet",
+                use_container_width=True
+            )
 
 def show_search_page():
     """Advanced search page"""
     st.header("🔍 Advanced Search")
     
-    tab1, tab2, tab3 = st.tabs(["By Genre", "By Director", "By Actor"])
+    tab_all, tab_advanced, tab1, tab2, tab3 = st.tabs(["Everything", "Advanced", "By Genre", "By Director", "By Actor"])
     
-    with tab1:
-        st.subheader("Search Movies by Genre")
-        conn = get_db_connection()
-        if conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM Genre ORDER BY name")
-            genres = [g[0] for g in cursor.fetchall()]
-            cursor.close()
-            conn.close()
+    # Genre and language choices shared by the tabs
+    genre_rows = cached_query("SELECT name FROM Genre ORDER BY name",
+                              ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+    genres = [g[0] for g in genre_rows] if genre_rows is not None else None
+    # Reads only the idx_movie_language_rating index
+    language_rows = cached_query("SELECT DISTINCT language FROM Movie WHERE language IS NOT NULL ORDER BY language",
+                                 ttl=CATALOG_TTL, tags=("catalog",), dictionary=False)
+    languages = [l[0] for l in language_rows or []]
+    
+    with tab_all:
+        st.subheader("Search Movies, Shows, Actors and Directors")
+        query_text = st.text_input("Search the catalog", placeholder="e.g. nolan, dark knight, stranger...")
+        
+        if query_text.strip():
+            results = None
+            with db_cursor(dictionary=True) as cursor:
+                if cursor:
+                    results = search_catalog(cursor, query_text)
             
-            selected_genre = st.selectbox("Select Genre", genres)
+            if results == []:
+                # Typo tolerance: retry once with the closest catalog words. The vocabulary
+                # loads on its own connection, so the search connection is returned first
+                suggestion = suggest_query(query_text, load_search_vocabulary())
+                if suggestion:
+                    with db_cursor(dictionary=True) as cursor:
+                        if cursor:
+                            results = search_catalog(cursor, suggestion)
+                    if results:
+                        st.caption(f"Showing results for **{suggestion}**")
             
-            if st.button("Search by Genre"):
-                conn = get_db_connection()
-                if conn:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.callproc('search_movies_by_genre', [selected_genre])
+            if results:
+                icons = {"Movie": "🎬", "TV Show": "📺", "Actor": "🎭", "Director": "🎥"}
+                st.write(f"**Found {len(results)} results:**")
+                for item in results:
+                    rating = f" ⭐ {item['ratings']:.2f}" if item['ratings'] is not None else ""
+                    year = f" ({item['info_date'].year})" if item['info_date'] else ""
+                    st.write(f"{icons.get(item['result_type'], '')} **{item['name']}**{year}{rating} · {item['result_type']}")
+            elif results is not None:
+                st.info("No matches found.")
+    
+    with tab_advanced:
+        st.subheader("Search Movies by Multiple Criteria")
+        with st.form("advanced_search_form"):
+            col1, col2 = st.columns(2)
+            with col1:
+                title = st.text_input("Title contains")
+                genre = st.selectbox("Genre", ["Any"] + (genres or []))
+                language = st.selectbox("Language", ["Any"] + languages)
+            with col2:
+                min_rating = st.slider("Minimum rating", 0.0, 5.0, 0.0, 0.5)
+                current_year = datetime.now().year
+                min_year, max_year = st.slider("Release year", 1900, current_year, (1900, current_year))
+            submit = st.form_submit_button("Search")
+        
+        if submit:
+            with db_cursor(dictionary=True) as cursor:
+                if cursor:
+                    # Unset filters are passed as NULL so the procedure leaves them out of the plan
+                    cursor.callproc('advanced_movie_search', [
+                        title.strip() or None,
+                        None if genre == "Any" else genre,
+                        min_rating or None,
+                        None if language == "Any" else language,
+                        None if min_year == 1900 else min_year,
+                        None if max_year == current_year else max_year
+                    ])
                     
                     movies = []
                     for result in cursor.stored_results():
                         movies = result.fetchall()
                     
                     if movies:
-                        st.write(f"**Found {len(movies)} movies in {selected_genre}:**")
+                        st.write(f"**Found {len(movies)} movies:**")
                         for movie in movies:
-                            st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f}")
+                            st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f} · {movie['language']}")
+                            if movie['genres']:
+                                st.caption(movie['genres'])
                     else:
-                        st.info("No movies found.")
+                        st.info("No movies match these filters.")
+    
+    with tab1:
+        st.subheader("Search Movies by Genre")
+        if genres is not None:
+            selected_genre = st.selectbox("Select Genre", genres)
+            
+            if st.button("Search by Genre"):
+                with db_cursor(dictionary=True) as cursor:
+                    if cursor:
+                        cursor.callproc('search_movies_by_genre', [selected_genre])
                     
-                    cursor.close()
-                    conn.close()
+                        movies = []
+                        for result in cursor.stored_results():
+                            movies = result.fetchall()
+                    
+                        if movies:
+                            st.write(f"**Found {len(movies)} movies in {selected_genre}:**")
+                            for movie in movies:
+                                st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f}")
+                        else:
+                            st.info("No movies found.")
     
     with tab2:
         st.subheader("Search Movies by Director")
@@ -741,25 +2274,21 @@ def show_search_page():
         
         if st.button("Search by Director"):
             if director_name:
-                conn = get_db_connection()
-                if conn:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.callproc('get_movies_by_director', [director_name])
+                with db_cursor(dictionary=True) as cursor:
+                    if cursor:
+                        cursor.callproc('get_movies_by_director', [director_name])
                     
-                    movies = []
-                    for result in cursor.stored_results():
-                        movies = result.fetchall()
-                    
-                    if movies:
-                        st.write(f"**Found {len(movies)} movies:**")
-                        for movie in movies:
-                            st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f}")
-                            st.caption(f"Director: {movie['director_name']}")
-                    else:
-                        st.info("No movies found for this director.")
+                        movies = []
+                        for result in cursor.stored_results():
+                            movies = result.fetchall()
                     
-                    cursor.close()
-                    conn.close()
+                        if movies:
+                            st.write(f"**Found {len(movies)} movies:**")
+                            for movie in movies:
+                                st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f}")
+                                st.caption(f"Director: {movie['director_name']}")
+                        else:
+                            st.info("No movies found for this director.")
     
     with tab3:
         st.subheader("Search Movies by Actor")
@@ -767,175 +2296,280 @@ def show_search_page():
         
         if st.button("Search by Actor"):
             if actor_name:
-                conn = get_db_connection()
-                if conn:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.callproc('get_movies_by_actor', [actor_name])
-                    
-                    movies = []
-                    for result in cursor.stored_results():
-                        movies = result.fetchall()
+                with db_cursor(dictionary=True) as cursor:
+                    if cursor:
+                        cursor.callproc('get_movies_by_actor', [actor_name])
                     
-                    if movies:
-                        st.write(f"**Found {len(movies)} movies:**")
-                        for movie in movies:
-                            st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f}")
-                            st.caption(f"Actor: {movie['actor_name']}")
-                    else:
-                        st.info("No movies found for this actor.")
+                        movies = []
+                        for result in cursor.stored_results():
+                            movies = result.fetchall()
                     
-                    cursor.close()
-                    conn.close()
+                        if movies:
+                            st.write(f"**Found {len(movies)} movies:**")
+                            for movie in movies:
+                                st.write(f"- **{movie['name']}** ({movie['release_date']}) ⭐ {movie['ratings']:.2f}")
+                                st.caption(f"Actor: {movie['actor_name']}")
+                        else:
+                            st.info("No movies found for this actor.")
 def show_statistics_page():
-    """Display statistics using views and functions"""
+    """Display statistics from the user_stats summary table and views"""
     st.header("📊 Statistics & Analytics")
     
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        
-        # User statistics from view
-        cursor.execute("SELECT * FROM user_stats_view WHERE user_id = %s", (st.session_state.user_id,))
-        user_stats = cursor.fetchone()
-        
-        if user_stats:
-            st.subheader("Your Activity")
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Total Reviews", user_stats['total_reviews'])
-            with col2:
-                avg_rating = user_stats['avg_rating_given']
-                st.metric("Avg Rating Given", f"{avg_rating:.2f}" if avg_rating else "N/A")
-            with col3:
-                st.metric("Movies Reviewed", user_stats['movies_reviewed'])
-            with col4:
-                st.metric("Episodes Reviewed", user_stats['episodes_reviewed'])
-        else:
-            st.info("Start reviewing movies and shows to see your statistics!")
-        
-        st.divider()
-        
-        # Detailed stats using functions
-        st.subheader("Detailed Stats")
-        col1, col2 = st.columns(2)
-        
+    # The user's summary row and both top-5 lists are independent, so they run concurrently
+    data = load_page_data(
+        user_stats=(query_rows, """
+            SELECT total_reviews, movies_reviewed, episodes_reviewed, total_likes_received,
+                   rating_sum / NULLIF(rating_count, 0) AS avg_rating_given
+            FROM user_stats
+            WHERE user_id = %s
+        """, (st.session_state.user_id,)),
+        # Same ordering as the popular_movies view, precomputed in the leaderboard
+        top_movies=(cached_query, """
+            SELECT m.name, m.ratings AS avg_rating, m.total_reviews
+            FROM title_leaderboard lb
+            JOIN Movie m ON m.movie_id = lb.entity_id
+            WHERE lb.board = 'top_movies'
+            ORDER BY lb.rank_no
+            LIMIT 5
+        """, (), LEADERBOARD_TTL, ("ratings",)),
+        top_shows=(cached_query, """
+            SELECT s.name, s.ratings, s.total_reviews
+            FROM title_leaderboard lb
+            JOIN tvshow s ON s.show_id = lb.entity_id
+            WHERE lb.board = 'top_shows'
+            ORDER BY lb.rank_no
+            LIMIT 5
+        """, (), LEADERBOARD_TTL, ("ratings",)),
+    )
+    if data['user_stats'] is None and 'user_stats' not in data.errors:
+        # Database unavailable; db_connection() has already reported it
+        return
+    user_stats = data['user_stats'][0] if data['user_stats'] else None
+    
+    if user_stats and user_stats['total_reviews']:
+        st.subheader("Your Activity")
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            try:
-                cursor.execute("SELECT get_user_avg_rating(%s) as avg_rating", (st.session_state.user_id,))
-                result = cursor.fetchone()
-                st.info(f"📊 **Average Rating (Function):** {result['avg_rating']:.2f}/5.0")
-            except:
-                st.info("📊 **Average Rating (Function):** N/A")
-            
-            try:
-                cursor.execute("SELECT count_user_reviews(%s) as review_count", (st.session_state.user_id,))
-                result = cursor.fetchone()
-                st.info(f"📝 **Total Review Count (Function):** {result['review_count']}")
-            except:
-                st.info("📝 **Total Review Count (Function):** 0")
-        
+            st.metric("Total Reviews", user_stats['total_reviews'])
         with col2:
-            try:
-                cursor.execute("SELECT count_movies_reviewed(%s) as movie_count", (st.session_state.user_id,))
-                result = cursor.fetchone()
-                st.info(f"🎬 **Movies Reviewed (Function):** {result['movie_count']}")
-            except:
-                st.info("🎬 **Movies Reviewed (Function):** 0")
+            avg_rating = user_stats['avg_rating_given']
+            st.metric("Avg Rating Given", f"{avg_rating:.2f}" if avg_rating else "N/A")
+        with col3:
+            st.metric("Movies Reviewed", user_stats['movies_reviewed'])
+        with col4:
+            st.metric("Episodes Reviewed", user_stats['episodes_reviewed'])
         
         st.divider()
         
-        # Platform statistics
-        st.subheader("Platform Statistics")
-        
+        # Detailed stats from the same row
+        st.subheader("Detailed Stats")
         col1, col2 = st.columns(2)
         
         with col1:
-            st.write("**Top Rated Movies**")
-            try:
-                # Use correct column names from popular_movies view
-                cursor.execute("""
-                    SELECT name, avg_rating, total_reviews 
-                    FROM popular_movies 
-                    LIMIT 5
-                """)
-                top_movies = cursor.fetchall()
-                if top_movies:
-                    for movie in top_movies:
-                        st.write(f"⭐ **{movie['name']}** - {movie['avg_rating']:.2f} ({movie['total_reviews']} reviews)")
-                else:
-                    st.info("No movies with reviews yet.")
-            except Exception as e:
-                st.error(f"Error loading movies: {e}")
+            st.info(f"📊 **Average Rating:** {avg_rating:.2f}/5.0" if avg_rating else "📊 **Average Rating:** N/A")
+            st.info(f"📝 **Total Review Count:** {user_stats['total_reviews']}")
         
         with col2:
-            st.write("**Top Rated Shows**")
-            try:
-                # Query directly for shows
-                cursor.execute("""
-                    SELECT s.name, s.ratings, COUNT(DISTINCT r.review_id) as total_reviews
-                    FROM tvshow s
-                    LEFT JOIN Episode e ON s.show_id = e.show_id
-                    LEFT JOIN Review r ON e.episode_id = r.episode_id
-                    GROUP BY s.show_id, s.name, s.ratings
-                    HAVING total_reviews > 0
-                    ORDER BY s.ratings DESC
-                    LIMIT 5
-                """)
-                top_shows = cursor.fetchall()
-                if top_shows:
-                    for show in top_shows:
-                        st.write(f"⭐ **{show['name']}** - {show['ratings']:.2f} ({show['total_reviews']} reviews)")
-                else:
-                    st.info("No shows with reviews yet.")
-            except Exception as e:
-                st.error(f"Error loading shows: {e}")
-        
-        cursor.close()
-        conn.close()
+            st.info(f"🎬 **Movies Reviewed:** {user_stats['movies_reviewed']}")
+            st.info(f"👍 **Likes Received:** {user_stats['total_likes_received']}")
+    elif 'user_stats' in data.errors:
+        st.error(f"Error loading your statistics: {data.errors['user_stats']}")
+    else:
+        st.info("Start reviewing movies and shows to see your statistics!")
+    
+    st.divider()
+    
+    # Platform statistics
+    st.subheader("Platform Statistics")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Top Rated Movies**")
+        if 'top_movies' in data.errors:
+            st.error(f"Error loading movies: {data.errors['top_movies']}")
+        elif data['top_movies']:
+            for movie in data['top_movies']:
+                st.write(f"⭐ **{movie['name']}** - {movie['avg_rating']:.2f} ({movie['total_reviews']} reviews)")
+        else:
+            st.info("No movies with reviews yet.")
+    
+    with col2:
+        st.write("**Top Rated Shows**")
+        if 'top_shows' in data.errors:
+            st.error(f"Error loading shows: {data.errors['top_shows']}")
+        elif data['top_shows']:
+            for show in data['top_shows']:
+                st.write(f"⭐ **{show['name']}** - {show['ratings']:.2f} ({show['total_reviews']} reviews)")
+        else:
+            st.info("No shows with reviews yet.")
+    
+    st.divider()
+    show_platform_analytics()
+
+def show_platform_analytics():
+    """Charts answered from the in-memory analytics snapshot instead of GROUP BY queries"""
+    engine = get_analytics_engine()
+    snapshot = engine.snapshot()
+    
+    col1, col2 = st.columns([5, 1])
+    with col1:
+        st.subheader("Platform Analytics")
+    with col2:
+        st.button("🔄 Refresh", on_click=engine.refresh, disabled=engine.refreshing,
+                  key="analytics_refresh", use_container_width=True)
+    
+    if snapshot is None:
+        if engine.last_error is not None:
+            st.error(f"Could not build the analytics snapshot: {engine.last_error}")
+        else:
+            st.info("The analytics snapshot is being built in the background; check back in a moment.")
+        return
+    refreshing = " · refreshing in the background" if engine.refreshing else ""
+    st.caption(f"Snapshot of {snapshot.review_count:,} reviews, {format_age(snapshot.age)} old "
+               f"(loaded in {snapshot.load_seconds:.1f}s){refreshing}")
+    
+    tab_genres, tab_languages, tab_volume = st.tabs(["Ratings by Genre", "Languages by Release Year", "Review Volume"])
+    
+    with tab_genres:
+        started = time.perf_counter()
+        distribution = snapshot.rating_distribution_by_genre()
+        summary = snapshot.genre_summary()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if distribution.empty:
+            st.info("No movie reviews yet.")
+        else:
+            st.write("**Share of each genre's reviews by rating**")
+            st.bar_chart(distribution)
+            st.dataframe(summary.round({"avg_rating": 2}), use_container_width=True)
+        st.caption(f"Computed in {elapsed_ms:.1f} ms")
+    
+    with tab_languages:
+        top_languages = st.slider("Languages", 1, 10, 5, key="analytics_languages")
+        started = time.perf_counter()
+        trend = snapshot.language_trend(top_languages)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if trend.empty:
+            st.info("No reviewed movies with a language and release date yet.")
+        else:
+            st.write("**Average review rating of movies by release year**")
+            st.line_chart(trend)
+        st.caption(f"Computed in {elapsed_ms:.1f} ms")
+    
+    with tab_volume:
+        freq = st.radio("Per", ["month", "year"], format_func=str.title, horizontal=True, key="analytics_freq")
+        started = time.perf_counter()
+        volume = snapshot.review_volume(freq)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if volume.empty:
+            st.info("No dated reviews yet.")
+        else:
+            st.write("**Reviews written**")
+            st.area_chart(volume)
+        st.caption(f"Computed in {elapsed_ms:.1f} ms")
 
 
 def show_profile_page():
     """Display and edit user profile"""
     st.header("👤 My Profile")
     
-    conn = get_db_connection()
-    if conn:
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM User WHERE user_id = %s", (st.session_state.user_id,))
-        user = cursor.fetchone()
+    with db_cursor(dictionary=True) as cursor:
+        if cursor:
+            # Profile and trigger-maintained stats in one query
+            cursor.execute("""
+                SELECT u.*,
+                       COALESCE(us.total_reviews, 0) AS total_reviews,
+                       COALESCE(us.movies_reviewed, 0) AS movies_reviewed,
+                       COALESCE(us.episodes_reviewed, 0) AS episodes_reviewed,
+                       COALESCE(us.rating_sum / NULLIF(us.rating_count, 0), 0.00) AS avg_rating
+                FROM User u
+                LEFT JOIN user_stats us ON us.user_id = u.user_id
+                WHERE u.user_id = %s
+            """, (st.session_state.user_id,))
+            user = cursor.fetchone()
         
-        if user:
-            col1, col2 = st.columns([1, 2])
+            if user:
+                col1, col2 = st.columns([1, 2])
             
-            with col1:
-                st.subheader("Profile Information")
-                st.write(f"**Username:** {user['username']}")
-                st.write(f"**Name:** {user['name']}")
-                st.write(f"**Email:** {user['email']}")
-                st.write(f"**Phone:** {user['ph_no']}")
-                st.write(f"**Date of Birth:** {user['dob']}")
-                st.write(f"**Address:** {user['address']}")
+                with col1:
+                    st.subheader("Profile Information")
+                    st.write(f"**Username:** {user['username']}")
+                    st.write(f"**Name:** {user['name']}")
+                    st.write(f"**Email:** {user['email']}")
+                    st.write(f"**Phone:** {user['ph_no']}")
+                    st.write(f"**Date of Birth:** {user['dob']}")
+                    st.write(f"**Address:** {user['address']}")
             
-            with col2:
-                st.subheader("Account Statistics")
-                
-                # Use functions to display stats
-                cursor.execute("SELECT get_user_avg_rating(%s) as avg_rating", (st.session_state.user_id,))
-                avg_rating = cursor.fetchone()['avg_rating']
+                with col2:
+                    st.subheader("Account Statistics")
                 
-                cursor.execute("SELECT count_user_reviews(%s) as total_reviews", (st.session_state.user_id,))
-                total_reviews = cursor.fetchone()['total_reviews']
-                
-                cursor.execute("SELECT count_movies_reviewed(%s) as movies_reviewed", (st.session_state.user_id,))
-                movies_reviewed = cursor.fetchone()['movies_reviewed']
-                
-                st.metric("Average Rating Given", f"{avg_rating:.2f}/5.0")
-                st.metric("Total Reviews", total_reviews)
-                st.metric("Movies Reviewed", movies_reviewed)
-                st.metric("Episodes Reviewed", total_reviews - movies_reviewed)
-        
-        cursor.close()
-        conn.close()
+                    st.metric("Average Rating Given", f"{user['avg_rating']:.2f}/5.0")
+                    st.metric("Total Reviews", user['total_reviews'])
+                    st.metric("Movies Reviewed", user['movies_reviewed'])
+                    st.metric("Episodes Reviewed", user['episodes_reviewed'])
+
+def show_admin_page():
+    """Display query timings, pool and cache health (admins only)"""
+    st.header("🛠️ Query Performance")
+    
+    query_log = get_query_log()
+    entries = query_log.entries()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    pool_stats = get_connection_pool().stats()
+    cache_stats = get_query_cache().stats()
+    with col1:
+        st.metric("Logged Queries", len(entries))
+    with col2:
+        st.metric("Connections In Use", f"{pool_stats['in_use']}/{pool_stats['pool_size']}")
+    with col3:
+        st.metric("Avg Checkout Wait", f"{pool_stats['avg_checkout_wait'] * 1000:.1f} ms")
+    with col4:
+        st.metric("Query Cache Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Export Query Log (JSON)",
+            data=query_log.to_json(),
+            file_name=f"query_log_{datetime.now():%Y%m%d_%H%M%S}.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    with col2:
+        if st.button("Clear Query Log", use_container_width=True):
+            query_log.clear()
+            st.rerun()
+    
+    if not entries:
+        st.info("No queries recorded yet.")
+        return
+    
+    st.subheader("Pages")
+    st.caption("Per rerun: number of queries and total time spent in SQL")
+    st.dataframe(query_log.page_summary(), use_container_width=True, hide_index=True)
+    
+    st.subheader("Slowest Statements")
+    st.dataframe(query_log.statement_summary()[:25], use_container_width=True, hide_index=True)
+    
+    st.subheader("Slowest Executions")
+    slowest = sorted(entries, key=lambda entry: entry["ms"], reverse=True)[:25]
+    st.dataframe(
+        [{"at": entry["at"], "page": entry["page"], "caller": entry["caller"], "ms": round(entry["ms"], 1),
+          "rows": entry["rows"], "params": entry["params_fingerprint"], "sql": entry["sql"]}
+         for entry in slowest],
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    with st.expander("Connection Pool, Query Cache and Password Hashing Counters"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.json(pool_stats)
+        with col2:
+            st.json(cache_stats)
+        with col3:
+            st.json(dict(get_password_hasher().metrics))
 
 if __name__ == "__main__":
     main()